@@ -2,26 +2,45 @@
 # -*- coding: utf-8 -*-
 
 import argparse
+import atexit
 import zipfile
 import stat
 from typing import List, Dict, Set
 import logging
 import os
-import tempfile
-import shutil
 import datetime
 import hashlib
+import io
 import re
 import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from PyPDF2 import PdfReader
 import pdfplumber
-from pymongo import MongoClient
+try:
+    # PyMuPDF 文本提取远快于 pdfplumber，未安装时回退 pdfplumber
+    import pymupdf
+    PYMUPDF_AVAILABLE = True
+except ImportError:
+    PYMUPDF_AVAILABLE = False
+from pymongo import MongoClient, InsertOne
 MONGO_AVAILABLE = True
 
 
 MONGO_CLIENT = None
 MONGO_DB = None
 
+# 固件整包只打开一次，所有检查共享同一个 ZipFile 句柄及其条目索引
+ZIP_HANDLE = None
+ZIP_NAMES = frozenset()
+ZIP_INFOS = {}
+
+# audit_logs / audit_checks 写入缓冲：攒满 _FLUSH_THRESHOLD 条后批量 bulk_write，
+# 避免每条断言都产生一次到远端 Mongo 的网络往返
+_LOG_BUF = deque()
+_CHECK_BUF = deque()
+_FLUSH_THRESHOLD = 200
+
 
 # 全局变量声明
 FIRMWARE_ZIP = None
@@ -160,20 +179,68 @@ def init_mongo():
     MONGO_DB = MONGO_CLIENT["firmware_audit"]
 
 
+def _flush_mongo():
+    """将缓冲区中的 audit_logs/audit_checks 文档批量写入 Mongo"""
+    if MONGO_DB is None:
+        _LOG_BUF.clear()
+        _CHECK_BUF.clear()
+        return
+    try:
+        if _LOG_BUF:
+            MONGO_DB["audit_logs"].bulk_write(list(_LOG_BUF), ordered=False)
+        if _CHECK_BUF:
+            MONGO_DB["audit_checks"].bulk_write(list(_CHECK_BUF), ordered=False)
+    except Exception as e:
+        print(f"[Mongo] 批量写入 audit_logs/audit_checks 失败: {e}")
+    finally:
+        _LOG_BUF.clear()
+        _CHECK_BUF.clear()
+
+
+atexit.register(_flush_mongo)
+
+
+def open_firmware_zip():
+    """
+    打开固件整包并缓存中央目录（条目名称集合与 ZipInfo 映射）
+
+    整包只在此处打开一次，各检查共用同一个 ZipFile 及其中央目录缓存，
+    不再各自重新打开并解析整包。
+    """
+    global ZIP_HANDLE, ZIP_NAMES, ZIP_INFOS
+    try:
+        # 传入普通的二进制文件对象：ZipFile 依赖 seekable()，mmap 在 Python 3.13 之前未提供该方法
+        zip_file = open(FIRMWARE_ZIP, 'rb')
+        ZIP_HANDLE = zipfile.ZipFile(zip_file, 'r', allowZip64=True)
+    except Exception as e:
+        print(f"无法读取ZIP文件: {e}")
+        exit(1)
+    ZIP_NAMES = frozenset(ZIP_HANDLE.namelist())
+    # dict 保持插入顺序，遍历时与 ZIP 内条目顺序一致
+    ZIP_INFOS = {zi.filename: zi for zi in ZIP_HANDLE.infolist()}
+    # 传入文件对象时 ZipFile.close() 不会关闭它；atexit 按注册的逆序执行，先关闭 ZipFile 再关闭文件
+    atexit.register(zip_file.close)
+    atexit.register(ZIP_HANDLE.close)
+
+
 initialize_globals()
 log_path = os.path.join(script_dir, 'logs')
 os.makedirs(log_path, exist_ok=True)
 log_file = os.path.join(log_path,f"{AUDIT_ID}.log")
 STATS = {"total": 0, "passed": 0, "warning": 0, "failed": 0}
-WORK_DIR_BASE = os.path.join(tempfile.gettempdir(), "fwcheck")
-os.makedirs(WORK_DIR_BASE, exist_ok=True)
-WORK_DIR = os.path.join(WORK_DIR_BASE, AUDIT_ID)
-os.makedirs(WORK_DIR, exist_ok=True)
 init_mongo()
+open_firmware_zip()
+# 根目录/厂商/产品/版本号均取自上传的文件名，代入正则前先转义：
+# 避免 '[' 等元字符导致模块加载时编译失败，也避免版本号中的 '.' 匹配任意字符
+_ROOT_RE = re.escape(root_dir)
+_MANUFACTURER_RE = re.escape(MANUFACTURER)
+_PRODUCT_RE = re.escape(PRODUCT)
+_FW_VERSION_RE = re.escape(FW_VERSION)
+
 BMCfirst_level_files = [
     f"{root_dir}/Tools",
     f"{root_dir}/TestReports",
-    rf"r'{root_dir}/{root_dir}\.(ima|bin|ima_flasher|hpm|tar)'",  # 需处理多扩展名
+    re.compile(rf"{_ROOT_RE}/{_ROOT_RE}\.(ima|bin|ima_flasher|hpm|tar)"),  # 需处理多扩展名
     f"{root_dir}/BMC Load Default Config.xlsx",
     f"{root_dir}/Release Note.pdf",
     f"{root_dir}/InbUpdateTool.zip",
@@ -183,11 +250,11 @@ BMCfirst_level_files = [
 BMCsecond_level_files = [
     f"{root_dir}/Tools/UpdateTools",
     f"{root_dir}/Tools/FruTools",
-    rf"r'{root_dir}/TestReports/{MANUFACTURER}_{PRODUCT}_(EVT|DVT|PVT|Gray|MP)_BMC_{FW_VERSION}_Pre-Test_Report\.xlsx'"
+    re.compile(rf"{_ROOT_RE}/TestReports/{_MANUFACTURER_RE}_{_PRODUCT_RE}_(EVT|DVT|PVT|Gray|MP)_BMC_{_FW_VERSION_RE}_Pre-Test_Report\.xlsx")
 
 ]
 BMCsecond_level_files_report = [
-    rf"r'{root_dir}/TestReports/{MANUFACTURER}_{PRODUCT}_(EVT|DVT|PVT|Gray|MP)_BMC_(1st|2nd)_Full_Test_Report\.xlsx'"
+    re.compile(rf"{_ROOT_RE}/TestReports/{_MANUFACTURER_RE}_{_PRODUCT_RE}_(EVT|DVT|PVT|Gray|MP)_BMC_(1st|2nd)_Full_Test_Report\.xlsx")
 ]
 BMCthird_level_files = [
     f"{root_dir}/Tools/UpdateTools/FW_Update_Tool_Release_Note.pdf",
@@ -198,7 +265,7 @@ BIOSfirst_level_files = [
     f"{root_dir}/Tools",
     f"{root_dir}/Setup",
     f"{root_dir}/TestReport",
-    rf"r'{root_dir}/{root_dir}\.(ima|bin|hpm|tar|rom)'",  # 需处理多扩展名 
+    re.compile(rf"{_ROOT_RE}/{_ROOT_RE}\.(ima|bin|hpm|tar|rom)"),  # 需处理多扩展名 
     f"{root_dir}/Release Note.pdf",
     f"{root_dir}/InbUpdateTool.zip",
     f"{root_dir}/OobUpdateTool.zip"
@@ -207,12 +274,12 @@ BIOSfirst_level_files = [
 BIOSsecond_level_files = [
     f"{root_dir}/Tools/Inband",
     f"{root_dir}/Tools/Outband",
-    rf"r'{root_dir}/TestReport/{MANUFACTURER}_{PRODUCT}_(EVT|DVT|PVT|Gray|MP)_BIOS_{FW_VERSION}_Pre-Test_Report\.xlsx'", 
-    rf"r'{root_dir}/Setup/SetupLayout_{MANUFACTURER}_{PRODUCT}_BIOS_{FW_VERSION}\.xlsx'",
-    rf"r'{root_dir}/Setup/SetupConfig_{MANUFACTURER}_{PRODUCT}_BIOS_{FW_VERSION}\.txt'"
+    re.compile(rf"{_ROOT_RE}/TestReport/{_MANUFACTURER_RE}_{_PRODUCT_RE}_(EVT|DVT|PVT|Gray|MP)_BIOS_{_FW_VERSION_RE}_Pre-Test_Report\.xlsx"), 
+    re.compile(rf"{_ROOT_RE}/Setup/SetupLayout_{_MANUFACTURER_RE}_{_PRODUCT_RE}_BIOS_{_FW_VERSION_RE}\.xlsx"),
+    re.compile(rf"{_ROOT_RE}/Setup/SetupConfig_{_MANUFACTURER_RE}_{_PRODUCT_RE}_BIOS_{_FW_VERSION_RE}\.txt")
 ]
 BIOSsecond_level_files_report = [
-    rf"r'{root_dir}/TestReport/{MANUFACTURER}_{PRODUCT}_(EVT|DVT|PVT|Gray|MP)_BIOS_(1st|2nd)_Full_Test_Report\.xlsx'"
+    re.compile(rf"{_ROOT_RE}/TestReport/{_MANUFACTURER_RE}_{_PRODUCT_RE}_(EVT|DVT|PVT|Gray|MP)_BIOS_(1st|2nd)_Full_Test_Report\.xlsx")
 ]
 
 BIOSthird_level_files = [
@@ -221,11 +288,6 @@ BIOSthird_level_files = [
     f"{root_dir}/Tools/Outband/OobConfigBios.sh",
     f"{root_dir}/Tools/Outband/OobConfigBios_Guide.pdf"
 ]
-replace_map = {
-    "MANUFACTURER": MANUFACTURER,
-    "PRODUCT": PRODUCT,
-    "FW_VERSION": FW_VERSION
-}
 
 
 
@@ -253,6 +315,27 @@ def setup_logger(logger_name, log_file):
     
     return logger
 
+
+# 按日志器名称缓存已配置的 logger，避免每次断言都重建 FileHandler
+_LOGGER_CACHE: Dict[str, logging.Logger] = {}
+
+
+def _get_logger(logger_name):
+    logger = _LOGGER_CACHE.get(logger_name)
+    if logger is None:
+        logger = setup_logger(logger_name, log_file)
+        _LOGGER_CACHE[logger_name] = logger
+    return logger
+
+# 断言结果查表：(是否通过, 是否为告警级别) -> (日志级别, 检查状态, STATS 字段)
+# 告警级别的检查无论是否通过都计入 warning 统计，检查状态仍按结果记为 PASS / WARNING
+_OUTCOME = {
+    (True, False): ("success", "PASS", "passed"),
+    (True, True): ("info", "PASS", "warning"),
+    (False, False): ("error", "FAIL", "failed"),
+    (False, True): ("warn", "WARNING", "warning"),
+}
+
 # 公共断言函数
 def log_assert(
     condition: bool,
@@ -263,7 +346,7 @@ def log_assert(
     check_name: str | None = None,
     standard: str | None = None,
 ) -> bool:
-    logger = setup_logger(logger_name, log_file)
+    logger = _get_logger(logger_name)
     level_name = logging.getLevelName(fail_level)
     if condition:
         text = f"[PASS] {message}"
@@ -272,32 +355,13 @@ def log_assert(
         text = f"[{level_name}] {message}"
         logger.log(fail_level, text)
 
+    # 按 (是否通过, 是否为告警级别) 一次查表得到日志级别、检查状态与统计字段
+    level, check_status, stat_key = _OUTCOME[(bool(condition), fail_level == logging.WARNING)]
     STATS["total"] += 1
-    if condition:
-        if fail_level == logging.WARNING:
-            STATS["warning"] += 1
-        else:
-            STATS["passed"] += 1
-    else:
-        if fail_level == logging.WARNING:
-            STATS["warning"] += 1
-        else:
-            STATS["failed"] += 1
-
+    STATS[stat_key] += 1
 
     try:
         ts = datetime.datetime.now(datetime.timezone.utc).isoformat()
-        if condition:
-            if fail_level == logging.WARNING:
-                level = "info"
-            else:
-                level = "success"
-        else:
-            if fail_level == logging.WARNING:
-                level = "warn"
-            else:
-                level = "error"
-
         doc = {
             "auditId": AUDIT_ID,
             "message": text,
@@ -307,18 +371,7 @@ def log_assert(
                 "testName": logger_name,
             },
         }
-        MONGO_DB["audit_logs"].insert_one(doc)
-
-        if condition:
-            if fail_level == logging.WARNING:
-                check_status = "PASS"
-            else:
-                check_status = "PASS"
-        else:
-            if fail_level == logging.WARNING:
-                check_status = "WARNING"
-            else:
-                check_status = "FAIL"
+        _LOG_BUF.append(InsertOne(doc))
 
         check_doc = {
             "auditId": AUDIT_ID,
@@ -329,7 +382,9 @@ def log_assert(
             "description": message,
             "standard": standard,
         }
-        MONGO_DB["audit_checks"].insert_one(check_doc)
+        _CHECK_BUF.append(InsertOne(check_doc))
+        if len(_LOG_BUF) >= _FLUSH_THRESHOLD or len(_CHECK_BUF) >= _FLUSH_THRESHOLD:
+            _flush_mongo()
     except Exception as e:
         print(f"[Mongo] 写入 audit_logs/audit_checks 失败: {e}")
 
@@ -340,19 +395,19 @@ def build_directory_tree(contents: List[str]) -> Dict[str, Set[str]]:
     tree = {}
     for item in contents:
         parts = item.rstrip('/').split('/')
-        for i in range(len(parts)):
-            parent_path = '/'.join(parts[:i])
-            current_dir = parts[i]
-            current_path = '/'.join(parts[:i+1]) if i > 0 else current_dir
+        last = len(parts) - 1
+        is_dir = item.endswith('/')
+        # 逐级累加父路径，避免对每个前缀重复 join
+        parent_path = ''
+        for i, current_dir in enumerate(parts):
+            current_path = f"{parent_path}/{current_dir}" if i > 0 else current_dir
             
-            if parent_path not in tree:
-                tree[parent_path] = set()
-            tree[parent_path].add(current_dir)
+            tree.setdefault(parent_path, set()).add(current_dir)
             
             # 如果当前路径不是文件（不以/结尾且不是最后一级），添加到树中
-            if i < len(parts) - 1 or item.endswith('/'):
-                if current_path not in tree:
-                    tree[current_path] = set()
+            if i < last or is_dir:
+                tree.setdefault(current_path, set())
+            parent_path = current_path
     return tree
 
 def print_zip_tree(zip_file: str, namelist, log_file) -> None:
@@ -364,26 +419,36 @@ def print_zip_tree(zip_file: str, namelist, log_file) -> None:
         return
     
     tree = build_directory_tree(contents)
+    # 先在内存中收集所有行，最后一次性写入日志文件
+    lines: List[str] = []
     
-    def print_subtree(path: str, prefix: str = ""):
-        """递归打印子目录树"""
-        items = sorted(tree.get(path, set()))
-        for i, item in enumerate(items):
-            is_last = i == len(items) - 1
-            item_prefix = "└── " if is_last else "├── "
-            item_path = f"{path}/{item}" if path else item
-            
-            # 区分目录和文件（目录以/结尾）
-            display_name = f"{item}/" if item_path in tree else item
-            with open(log_file, 'a', encoding='utf-8') as z:
-                z.write(f"{prefix}{item_prefix}{display_name}\n")
-            
-            # 如果是目录，递归打印子目录
-            if item_path in tree:
-                sub_prefix = "    " if is_last else "│   "
-                print_subtree(item_path, prefix + sub_prefix)
+    def child_entries(path: str, prefix: str):
+        """返回目录下按名称排序的子节点：(路径, 名称, 前缀, 是否为最后一个)"""
+        items = sorted(tree.get(path, ()))
+        last = len(items) - 1
+        return [
+            (f"{path}/{item}" if path else item, item, prefix, i == last)
+            for i, item in enumerate(items)
+        ]
+    
+    # 使用显式栈做先序遍历，子节点逆序入栈以保持输出顺序
+    stack = child_entries("", "")[::-1]
+    while stack:
+        item_path, item, prefix, is_last = stack.pop()
+        item_prefix = "└── " if is_last else "├── "
+        is_dir = item_path in tree
+        
+        # 区分目录和文件（目录以/结尾）
+        display_name = f"{item}/" if is_dir else item
+        lines.append(f"{prefix}{item_prefix}{display_name}\n")
+        
+        # 如果是目录，继续展开子目录
+        if is_dir:
+            sub_prefix = "    " if is_last else "│   "
+            stack.extend(reversed(child_entries(item_path, prefix + sub_prefix)))
     
-    print_subtree("")
+    with open(log_file, 'a', encoding='utf-8') as z:
+        z.writelines(lines)
 
 def clean_string(s):
     """清理字符串，去除首尾空格和不可见字符"""
@@ -433,147 +498,122 @@ def test_firmware_naming():
             category="扩展名.zip 命名规范"
         )
     ]
-    # 步骤 6: 解压固件包，逐个检查内部文件名是否全部为英文（ASCII）
-    try:
-        with zipfile.ZipFile(FIRMWARE_ZIP, 'r') as zf:
-            for name in zf.namelist():
-                checks.append(
-                    log_assert(
-                        all(c.isascii() for c in name),
-                        f"文件名使用英文: {name}",
-                        test_name,
-                        category="目录结构全部为英文"
-                    )
-                )
-    except Exception as e:
-        checks.append(
-            log_assert(
-                False,
-                f"检查文件文件名含中文: {str(e)}",
-                test_name,
-                category="目录结构全部为英文"
-            )
+    # 步骤 6: 基于缓存的条目索引，汇总检查内部文件名是否全部为英文（ASCII），只记录一条结果
+    non_ascii = [name for name in ZIP_INFOS if not name.isascii()]
+    checks.append(
+        log_assert(
+            not non_ascii,
+            f"文件名使用英文: 共 {len(ZIP_INFOS)} 个条目，{len(non_ascii)} 个异常 {non_ascii[:3]}",
+            test_name,
+            category="目录结构全部为英文"
         )
-    
+    )
+
     return all(checks)
 
-def test_files_in_zip(zip_path):
+def test_files_in_zip(zip_names):
     test_name = test_files_in_zip.__name__
     checks = []
 
-    # 步骤 7: 打开固件 ZIP 包，准备检查根目录及编译说明文件
-    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-        # 步骤 8: 检查是否存在预期的根目录 root_dir
-        root_dir_exists = any(
-            name == f"{root_dir}/" or name.startswith(f"{root_dir}/") 
-            for name in zip_ref.namelist()
+    # 步骤 7: 遍历一次固件 ZIP 包的条目集合，归类出顶级目录与文件名，供后续 O(1) 查找
+    top_level_dirs = set()
+    base_names = set()
+    for name in zip_names:
+        head, sep, _ = name.partition('/')
+        if sep:
+            top_level_dirs.add(head)
+        base_names.add(name.rsplit('/', 1)[-1])
+
+    # 步骤 8: 检查是否存在预期的根目录 root_dir
+    root_dir_exists = root_dir in top_level_dirs
+    checks.append(
+        log_assert(
+            root_dir_exists,
+            f"检查根目录:{root_dir}",
+            test_name,
+            category="存在预期的根目录 root_dir"
         )
-        checks.append(
-            log_assert(
-                root_dir_exists,
-                f"检查根目录:{root_dir}",
-                test_name,
-                category="存在预期的根目录 root_dir"
+    )
+    # 步骤 9: 对 BMC 固件，根据 BMCtype 检查对应编译说明文件是否存在
+    if FW_TYPE == "BMC":
+        if BMCtype == "AMI":
+            has_ami = "BMC_Compile_Note.txt" in base_names
+            checks.append(
+                log_assert(
+                    has_ami,
+                    f"检查编译文件文件(for AMI)：BMC_Compile_Note.txt",
+                    test_name,
+                    category="对应编译说明文件"
+                )
             )
-        )
-        # 步骤 9: 对 BMC 固件，根据 BMCtype 检查对应编译说明文件是否存在
-        if FW_TYPE == "BMC":
-            if BMCtype == "AMI":
-                has_ami = any(name.endswith(("BMC_Compile_Note.txt")) for name in zip_ref.namelist())
-                checks.append(
-                    log_assert(
-                        has_ami,
-                        f"检查编译文件文件(for AMI)：BMC_Compile_Note.txt",
-                        test_name,
-                        category="对应编译说明文件"
-                    )
+        elif BMCtype == "OpenBMC":
+            has_ami = "BMC_Release_Guide.txt" in base_names
+            checks.append(
+                log_assert(
+                    has_ami,
+                    f"检查编译文件文件(for Open BMC)：BMC_Release_Guide.txt",
+                    test_name,
+                    category="对应编译说明文件"
                 )
-            elif BMCtype == "OpenBMC":
-                has_ami = any(name.endswith(("BMC_Release_Guide.txt")) for name in zip_ref.namelist())
-                checks.append(
-                    log_assert(
-                        has_ami,
-                        f"检查编译文件文件(for Open BMC)：BMC_Release_Guide.txt",
-                        test_name,
-                        category="对应编译说明文件"
-                    )
+            )
+        else:
+            checks.append(
+                log_assert(
+                    True,
+                    f"自有框架没有编译文件",
+                    test_name
                 )
-            else:
-                checks.append(
-                    log_assert(
-                        True,
-                        f"自有框架没有编译文件",
-                        test_name
-                    )
-                )   
+            )   
                 
     return all(checks)
 
 
-def test_paths_in_zip(zip_path, path_patterns, replace_map=None, fileC="", fail_level=logging.ERROR):
+def test_paths_in_zip(zip_names, path_patterns, fileC="", fail_level=logging.ERROR):
     """
     检查 ZIP 文件中是否包含指定路径列表（支持正则）。
     
-    :param zip_path: ZIP 文件路径
-    :param path_patterns: 要检查的路径列表，可以是普通字符串或正则表达式（以 r'...' 表示）
-    :param replace_map: 字典，用于替换路径模板中的变量，如 {MANUFACTURER: "Dell", ...}
+    :param zip_names: ZIP 文件条目名称集合（由 open_firmware_zip 缓存）
+    :param path_patterns: 要检查的路径列表，可以是普通字符串或预编译的正则表达式（re.Pattern），
+                          厂商/产品/版本号等变量已在模块加载时代入
     :return: (found_items, missing_items)
     """
     test_name = test_paths_in_zip.__name__
     missing_items = []
     checks = []
 
-    # 步骤 10: 打开固件 ZIP 包并缓存所有条目名称用于后续路径匹配
-    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-        zip_contents = set(zip_ref.namelist())
-
-    # 步骤 11: 根据 replace_map 对路径模板中的变量（如厂商/产品）进行替换
-    if replace_map:
-        replaced_patterns = []
-        for pattern in path_patterns:
-            for key, value in replace_map.items():
-                pattern = pattern.replace(f"{{{key}}}", re.escape(value))
-            replaced_patterns.append(pattern)
-        path_patterns = replaced_patterns
-    
+    # 步骤 10: 使用已缓存的 ZIP 条目名称进行后续路径匹配
+    zip_contents = zip_names
+
     # 步骤 12: 收集 ZIP 中实际存在的 OobConfigBios 文件，用于后续必选/可选判断
     oob_files_in_zip = [item for item in zip_contents if 'OobConfigBios' in item]
+    # 去掉结尾 '/' 的条目路径集合，普通路径优先按完整路径 O(1) 命中
+    zip_paths = {item.rstrip('/') for item in zip_contents}
 
     # 步骤 13: 遍历每个预期路径/模式，按规则决定是否需要检查
     for pattern in path_patterns:
-        is_full_test_report = '_Full_Test_Report' in pattern
-        skip_check = is_full_test_report and not submit
-        
-        if skip_check:
-            # 当 submit=False 时，跳过 _Full_Test_Report 路径的强制检查，仅记录警告
-            continue
-        
+        is_regex = isinstance(pattern, re.Pattern)
+        # 日志与分类判断统一使用模式的文本形式
+        pattern_text = pattern.pattern if is_regex else pattern
         matched = False
-        is_regex = isinstance(pattern, str) and (pattern.startswith("r'") or pattern.startswith('r"'))
 
         if is_regex:
-            # 步骤 14: 将原始字符串解析为正则表达式，在 ZIP 条目中按模式匹配
-            try:
-                regex_pattern = eval(pattern)  # 将 r'xxx' 转为原始字符串
-                regex = re.compile(regex_pattern)
-                for item in zip_contents:
-                    if regex.search(item): 
-                        matched = True
-                        checks.append(
-                            log_assert(
-                                True,
-                                f"检查层级目录{fileC}: {pattern}",
-                                test_name,
-                                fail_level=fail_level,
-                                category="层级目录"
-                            )
-                        )
-                        break
-            except Exception as e:
-                print(f"[ERROR] 正则解析失败: {pattern}, 错误: {e}")
+            # 步骤 14: 使用模块加载时预编译的正则表达式，在 ZIP 条目中按模式匹配
+            if any(pattern.search(item) for item in zip_contents):
+                matched = True
+                checks.append(
+                    log_assert(
+                        True,
+                        f"检查层级目录{fileC}: {pattern_text}",
+                        test_name,
+                        fail_level=fail_level,
+                        category="层级目录"
+                    )
+                )
         else:
             # 步骤 15: 按普通路径字符串结尾进行匹配，判断是否存在对应文件/目录
-            if any(item.rstrip('/').endswith(pattern.rstrip('/')) for item in zip_contents):
+            # （完整路径未命中时才回退逐条比较结尾）
+            expected_path = pattern.rstrip('/')
+            if expected_path in zip_paths or any(item.endswith(expected_path) for item in zip_paths):
                 matched = True
                 checks.append(
                     log_assert(
@@ -587,31 +627,42 @@ def test_paths_in_zip(zip_path, path_patterns, replace_map=None, fileC="", fail_
 
         if not matched:
             # 步骤 16: 对未匹配路径，区分 OobConfigBios 可选项与必选项并记录结果
-            if 'OobConfigBios' in pattern and not oob_files_in_zip:
+            if 'OobConfigBios' in pattern_text and not oob_files_in_zip:
                 # 记录警告而非错误
-                checks.append(log_assert(False, f"非必须文件不存在: {pattern}", test_name, fail_level=logging.WARNING, category="目录结构"))
+                checks.append(log_assert(False, f"非必须文件不存在: {pattern_text}", test_name, fail_level=logging.WARNING, category="目录结构"))
             else:
                 # 其他情况正常处理
-                missing_items.append(pattern)
-                checks.append(log_assert(False, f"检查层级目录{fileC}: {pattern}", test_name, fail_level=fail_level, category="目录结构"))
+                missing_items.append(pattern_text)
+                checks.append(log_assert(False, f"检查层级目录{fileC}: {pattern_text}", test_name, fail_level=fail_level, category="目录结构"))
            
     return all(checks)
 
-def check_extracts_to_current_dir(zip_file_path):
+def check_extracts_to_current_dir(zip_file):
     """
     检查ZIP文件解压后是否会释放到当前目录
+
+    :param zip_file: ZIP 文件路径、文件对象或已打开的 ZipFile
     """
-    with zipfile.ZipFile(zip_file_path, 'r') as zf:
-        top_level_entries = set()
-        
-        for name in zf.namelist():
-            # 获取路径的第一部分（顶级目录/文件）
-            parts = name.split('/')
-            if parts and parts[0]:
-                top_level_entries.add(parts[0])
-        
-        # 如果有多个顶级条目，或者顶级条目包含文件而非目录，则会释放到当前目录
-        return len(top_level_entries) > 1 or any('.' in entry for entry in top_level_entries)
+    if isinstance(zip_file, zipfile.ZipFile):
+        names = zip_file.namelist()
+    else:
+        with zipfile.ZipFile(zip_file, 'r') as zf:
+            names = zf.namelist()
+
+    # 出现第二个不同的顶级条目，或顶级条目包含文件而非目录，即可判定会释放到当前目录
+    first = None
+    for name in names:
+        # 获取路径的第一部分（顶级目录/文件）
+        top = name.split('/', 1)[0]
+        if not top:
+            continue
+        if first is None:
+            first = top
+        elif top != first:
+            return True
+        if '.' in top:
+            return True
+    return False
 
 
 def test_operation_tool():
@@ -649,94 +700,118 @@ def test_operation_tool():
     test_name = test_operation_tool.__name__
     checks = []
     
-    # 步骤 18: 打开整包固件 ZIP，遍历每一个运维工具子包
-    with zipfile.ZipFile(FIRMWARE_ZIP, 'r') as zf:
-        for tool in tool_configs.keys():
-            zip_path = f"{root_dir}/{tool}.zip"
-            
-            # 步骤 19: 检查运维工具 ZIP 包是否存在于固件根目录
+    # 步骤 18: 使用已打开的整包固件 ZIP，遍历每一个运维工具子包
+    zf = ZIP_HANDLE
+    for tool in tool_configs.keys():
+        zip_path = f"{root_dir}/{tool}.zip"
+        
+        # 步骤 19: 检查运维工具 ZIP 包是否存在于固件根目录
+        checks.append(
+            log_assert(
+                zip_path in ZIP_NAMES,
+                f"检查运维工具包存在性: {zip_path}",
+                test_name,
+                category="运维工具"
+            )
+        )
+        
+        # 跳过不存在的工具包
+        if zip_path not in ZIP_NAMES:
+            continue
+        
+        # 步骤 20: 将工具 ZIP 读入内存，为后续检查做准备（无需落盘临时文件）
+        tool_zip = io.BytesIO(zf.read(zip_path))
+
+        with zipfile.ZipFile(tool_zip) as tz:
+            tool_names = set(tz.namelist())
+            # 步骤 21: 检查工具 ZIP 解压后是否直接释放在当前目录
+            extracts_to_current = check_extracts_to_current_dir(tz)
             checks.append(
                 log_assert(
-                    zip_path in zf.namelist(),
-                    f"检查运维工具包存在性: {zip_path}",
+                    extracts_to_current,
+                    f"运维工具解压路径检查: {tool}.zip 解压到当前目录",
                     test_name,
                     category="运维工具"
                 )
             )
             
-            # 跳过不存在的工具包
-            if zip_path not in zf.namelist():
-                continue
-            
-            # 步骤 20: 将工具 ZIP 写入临时文件，为后续解压及检查做准备
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.zip') as temp_file:
-                temp_path = temp_file.name
-                temp_file.write(zf.read(zip_path))
+            # 步骤 22: 根据 FW_TYPE 获取当前工具的检查配置（脚本及文档）
+            config = tool_configs[tool][FW_TYPE]
+            required_files = config["scripts"].union(config["docs"])
             
-            with zf.open(zip_path) as tool_zip:
-                with zipfile.ZipFile(tool_zip) as tz:
-                    # 步骤 21: 检查工具 ZIP 解压后是否直接释放在当前目录
-                    extracts_to_current = check_extracts_to_current_dir(temp_path)
+            # 步骤 23: 如果解压到当前目录，逐个检查每个必需文件是否存在
+            if extracts_to_current:
+                for file in required_files:
+                    file_exists = file in tool_names
                     checks.append(
                         log_assert(
-                            extracts_to_current,
-                            f"运维工具解压路径检查: {tool}.zip 解压到当前目录",
+                            file_exists,
+                            f"运维工具文件检查: {tool}.zip 应包含文件 {file}",
                             test_name,
                             category="运维工具"
                         )
                     )
-                    
-                    # 步骤 22: 根据 FW_TYPE 获取当前工具的检查配置（脚本及文档）
-                    config = tool_configs[tool][FW_TYPE]
-                    required_files = config["scripts"].union(config["docs"])
-                    
-                    # 步骤 23: 如果解压到当前目录，逐个检查每个必需文件是否存在
-                    if extracts_to_current:
-                        for file in required_files:
-                            file_exists = file in tz.namelist()
-                            checks.append(
-                                log_assert(
-                                    file_exists,
-                                    f"运维工具文件检查: {tool}.zip 应包含文件 {file}",
-                                    test_name,
-                                    category="运维工具"
-                                )
-                            )
-                    else:
-                        # 如果解压到子目录，所有文件检查失败
-                        for file in required_files:
-                            checks.append(
-                                log_assert(
-                                    False,
-                                    f"运维工具文件检查: {tool}.zip 应解压到当前目录以包含文件 {file}",
-                                    test_name,
-                                    category="运维工具"
-                                )
+            else:
+                # 如果解压到子目录，所有文件检查失败
+                for file in required_files:
+                    checks.append(
+                        log_assert(
+                            False,
+                            f"运维工具文件检查: {tool}.zip 应解压到当前目录以包含文件 {file}",
+                            test_name,
+                            category="运维工具"
+                        )
+                    )
+            
+            # 步骤 24: 对所有脚本文件检查执行权限（仅脚本，不检查文档）
+            if extracts_to_current:
+                for script in config["scripts"]:
+                    if script in tool_names:
+                        st_mode = tz.getinfo(script).external_attr >> 16
+                        checks.append(
+                            log_assert(
+                                st_mode & (stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH),
+                                f"运维工具权限检查: {script} (权限: {oct(st_mode)})",
+                                test_name,
+                                category="运维工具"
                             )
-                    
-                    # 步骤 24: 对所有脚本文件检查执行权限（仅脚本，不检查文档）
-                    if extracts_to_current:
-                        for script in config["scripts"]:
-                            if script in tz.namelist():
-                                st_mode = tz.getinfo(script).external_attr >> 16
-                                checks.append(
-                                    log_assert(
-                                        st_mode & (stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH),
-                                        f"运维工具权限检查: {script} (权限: {oct(st_mode)})",
-                                        test_name,
-                                        category="运维工具"
-                                    )
-                                )
-                os.unlink(temp_path)  # 清理临时文件
+                        )
     return all(checks)
 
+def calculate_digest(file_path, algo="md5"):
+    """
+    计算文件摘要，返回十六进制字符串。
+
+    Python 3.11+ 使用 hashlib.file_digest 在 C 层循环读取（释放 GIL），
+    低版本退回 1 MiB 分块读取。algo 可选 hashlib 支持的任意算法（如 blake2b），
+    但 Release Note 中登记的是 MD5，比对 PDF 时需保持默认值。
+    """
+    with open(file_path, "rb", buffering=0) as f:
+        return _digest_fileobj(f, algo)
+
+def _digest_fileobj(f, algo="md5"):
+    """对已打开的二进制文件对象计算摘要；低版本复用同一块 1 MiB 缓冲区 readinto，避免逐块分配 bytes"""
+    if hasattr(hashlib, "file_digest"):
+        return hashlib.file_digest(f, algo).hexdigest()
+    digest = hashlib.new(algo)
+    buf = memoryview(bytearray(1024 * 1024))
+    while n := f.readinto(buf):
+        digest.update(buf[:n])
+    return digest.hexdigest()
+
 def calculate_md5(file_path):
     """计算文件的MD5值"""
-    md5 = hashlib.md5()
-    with open(file_path, "rb") as f:
-        for chunk in iter(lambda: f.read(4096), b""):
-            md5.update(chunk)
-    return md5.hexdigest()
+    return calculate_digest(file_path, "md5")
+
+def md5_of_zip_member(zf, name):
+    """直接从 ZIP 条目流计算 MD5，无需先解压到磁盘再读回"""
+    with zf.open(name, 'r') as fp:
+        return _digest_fileobj(fp, "md5")
+
+def md5_of_zip_file_member(zip_file_path, name):
+    """以独立的 ZipFile 句柄计算条目 MD5，供线程池并发调用"""
+    with zipfile.ZipFile(zip_file_path, 'r') as zf:
+        return md5_of_zip_member(zf, name)
 
 def find_md5_in_pdf(pdf_path, target_md5):
     """在PDF中查找MD5值并返回包含该行和上一行的内容"""
@@ -750,10 +825,11 @@ def find_md5_in_pdf(pdf_path, target_md5):
                 page_lines = [line.strip() for line in page_text.split('\n') if line.strip()]
                 lines.extend(page_lines)
             
-            # 查找包含MD5的行及其上一行
+            # 查找包含MD5的行及其上一行（"0x" 前缀形式同样包含目标串，无需单独判断）
+            target = target_md5.lower()
             results = []
             for i, line in enumerate(lines):
-                if target_md5.lower() in line.lower() or f"0x{target_md5.lower()}" in line.lower():
+                if target in line.lower():
                     prev_line = lines[i-1] if i > 0 else ""
                     results.append({
                         "previous_line": prev_line,
@@ -765,35 +841,178 @@ def find_md5_in_pdf(pdf_path, target_md5):
         return []
 
 
-def search_md5_in_pdf_with_pypdf2(pdf_path, target_str):
+def _clean_pdf_text(text):
+    """文本清洗（去空白、统一小写，避免格式干扰匹配）"""
+    return text.lower().replace(" ", "").replace("\n", "").replace("\t", "")
+
+
+def _pdfplumber_page_texts(pdf):
+    """按页生成 pdfplumber 提取的文本（普通文本 + 表格单元格内容）"""
+    for page in pdf.pages:
+        # 3.1 提取页面普通文本（非表格区域）
+        page_text = (page.extract_text() or "") + "\n"  # 加换行分隔，避免内容粘连
+
+        # 3.2 提取页面所有表格，拼接单元格内容
+        tables = page.extract_tables()  # 提取所有表格（返回二维列表）
+        for table in tables:
+            # 遍历表格的每一行
+            for row in table:
+                # 遍历行内每个单元格，过滤空值，拼接内容
+                row_text = " ".join([str(cell).strip() for cell in row if cell is not None])
+                page_text += row_text + "\n"  # 行内内容拼接后加换行
+        yield page_text
+
+
+def _iter_clean_pdf_pages(pdf_data):
+    """
+    按页生成清洗后的 PDF 文本（pdf_data 为内存中的 PDF 字节内容）。
+
+    优先使用 PyMuPDF（表格单元格文字同样包含在页面文本中，无需单独提取表格），
+    失败时回退 pdfplumber，并跳过已经产出的页面。
+    """
+    produced = 0
+    if PYMUPDF_AVAILABLE:
+        try:
+            with pymupdf.open(stream=pdf_data, filetype="pdf") as doc:
+                for page in doc:
+                    yield _clean_pdf_text(page.get_text("text"))
+                    produced += 1
+            return
+        except Exception as e:
+            logging.error(f"PyMuPDF读取异常，回退pdfplumber：{str(e)}")
     try:
-        with pdfplumber.open(pdf_path) as pdf:
-            pdf_text = ""
-            for page in pdf.pages:
-                # 3.1 提取页面普通文本（非表格区域）
-                page_plain_text = page.extract_text() or ""
-                pdf_text += page_plain_text + "\n"  # 加换行分隔，避免内容粘连
-
-                # 3.2 提取页面所有表格，拼接单元格内容
-                tables = page.extract_tables()  # 提取所有表格（返回二维列表）
-                for table in tables:
-                    # 遍历表格的每一行
-                    for row in table:
-                        # 遍历行内每个单元格，过滤空值，拼接内容
-                        row_text = " ".join([str(cell).strip() for cell in row if cell is not None])
-                        pdf_text += row_text + "\n"  # 行内内容拼接后加换行
-
-        # 4. 文本清洗（去空白、统一小写，避免格式干扰匹配）
-        clean_pdf_text = pdf_text.lower().replace(" ", "").replace("\n", "").replace("\t", "")
-        clean_target = target_str.lower().replace(" ", "").replace("\n", "").replace("\t", "")
-        
-        if clean_target in clean_pdf_text:
-            return True
-        return False
+        with pdfplumber.open(io.BytesIO(pdf_data)) as pdf:
+            for index, page_text in enumerate(_pdfplumber_page_texts(pdf)):
+                if index >= produced:
+                    yield _clean_pdf_text(page_text)
     except Exception as e:
         logging.error(f"PDF读取异常：{str(e)}")
 
 
+# Release Note 解析缓存：ZIP 条目名（或本地 PDF 路径）-> PDF 内容、内容流与已解析页面文本中出现的全部 32 位十六进制串及剩余页面生成器
+# 同一份 Release Note 会被多次查找不同的 MD5，每页最多解析一次，且只解析到命中为止
+_PDF_TEXT_CACHE: Dict[str, dict] = {}
+_MD5_LEN = 32
+_MD5_RE = re.compile(r"[0-9a-f]{32}")
+_HEX_RUN_RE = re.compile(r"[0-9a-f]{32,}")
+
+
+def _new_pdf_entry(pdf_data):
+    return {
+        "data": pdf_data,
+        "raw_md5s": None,
+        "pages": [],
+        "md5s": set(),
+        "tail": "",
+        "remaining": _iter_clean_pdf_pages(pdf_data),
+    }
+
+
+def _add_md5_windows(md5s, text):
+    """把 text 中各十六进制串内所有长度为 32 的窗口加入集合"""
+    for m in _HEX_RUN_RE.finditer(text):
+        run = m.group()
+        for i in range(len(run) - _MD5_LEN + 1):
+            md5s.add(run[i:i + _MD5_LEN])
+
+
+def _raw_content_md5s(pdf_data):
+    """
+    扫描各页内容流（解压后的原始字节）中出现的 32 位十六进制串。
+
+    只解压内容流，不做字体映射与版面还原，远快于文本提取；常见的 Release Note 中
+    MD5 以字面字符串写入内容流，可直接命中。未命中时仍需回退到文本提取
+    （文字可能被字距调整拆开，或使用 CID 字体编码）。
+    """
+    md5s = set()
+    try:
+        if PYMUPDF_AVAILABLE:
+            with pymupdf.open(stream=pdf_data, filetype="pdf") as doc:
+                streams = [page.read_contents() for page in doc]
+        else:
+            streams = []
+            for page in PdfReader(io.BytesIO(pdf_data)).pages:
+                contents = page.get_contents()
+                if contents is not None:
+                    streams.append(contents.get_data())
+    except Exception as e:
+        logging.error(f"PDF内容流读取异常：{str(e)}")
+        return md5s
+    for raw in streams:
+        _add_md5_windows(md5s, raw.decode('latin-1').lower())
+    return md5s
+
+
+def load_release_note(zf, member):
+    """
+    从 ZIP 条目把 Release Note 读入内存并登记到解析缓存，返回缓存键（条目名）。
+
+    两个 MD5 测试共用同一条目的缓存，无需解压到磁盘，也不会重复读取与解析。
+    """
+    if member not in _PDF_TEXT_CACHE:
+        _PDF_TEXT_CACHE[member] = _new_pdf_entry(zf.read(member))
+    return member
+
+
+def _index_pdf_page(entry, page_text):
+    """
+    记录新解析的一页文本，并把其中所有长度为 32 的十六进制窗口加入 MD5 集合。
+
+    清洗后的文本去掉了空白，MD5 可能与前后的十六进制字符粘连，因此按窗口而非整段匹配；
+    拼接上一页末尾 31 个字符，保证跨页断开的 MD5 也能命中。
+    """
+    entry["pages"].append(page_text)
+    segment = entry["tail"] + page_text
+    _add_md5_windows(entry["md5s"], segment)
+    entry["tail"] = segment[-(_MD5_LEN - 1):]
+
+
+def search_md5_in_pdf_with_pypdf2(pdf_path, target_str):
+    clean_target = _clean_pdf_text(target_str)
+    entry = _PDF_TEXT_CACHE.get(pdf_path)
+    if entry is None:
+        # 未经 load_release_note 登记时按本地文件路径读取
+        try:
+            with open(pdf_path, 'rb') as f:
+                pdf_data = f.read()
+        except OSError as e:
+            logging.error(f"PDF读取异常：{str(e)}")
+            return False
+        entry = _PDF_TEXT_CACHE[pdf_path] = _new_pdf_entry(pdf_data)
+
+    if _MD5_RE.fullmatch(clean_target):
+        # MD5：先查内容流中的字面十六进制串，再查已解析页面的窗口集合，都未命中才按需解析后续页面
+        if entry["raw_md5s"] is None:
+            entry["raw_md5s"] = _raw_content_md5s(entry["data"])
+        if clean_target in entry["raw_md5s"] or clean_target in entry["md5s"]:
+            return True
+        if entry["remaining"] is None:
+            return False
+        for page_text in entry["remaining"]:
+            _index_pdf_page(entry, page_text)
+            if clean_target in entry["md5s"]:
+                return True
+        entry["remaining"] = None
+        return False
+
+    # 其他字符串：在已解析文本中查找，未命中再逐页解析，并拼接前文末尾以匹配跨页断开的目标
+    parsed_text = "".join(entry["pages"])
+    if clean_target in parsed_text:
+        return True
+    if entry["remaining"] is None:
+        return False
+    overlap = len(clean_target) - 1
+    carry = parsed_text[-overlap:] if overlap else ""
+    for page_text in entry["remaining"]:
+        _index_pdf_page(entry, page_text)
+        segment = carry + page_text
+        if clean_target in segment:
+            return True
+        carry = segment[-overlap:] if overlap else ""
+    entry["remaining"] = None
+    return False
+
+
 
 
 def search_md5_in_pdf_with_pypdf2_old(pdf_path: str, target_md5: str) -> bool:
@@ -847,57 +1066,80 @@ def search_md5_in_pdf_with_pypdf2_old(pdf_path: str, target_md5: str) -> bool:
     except Exception as e:
         raise ValueError(f"读取PDF失败：{str(e)}") from e
 
-def test_images_md5_zip(zip_file_path):
+def test_images_md5_zip(zip_file, zip_file_path):
+    """
+    验证zip包中.bin和.hpm/.tar文件的MD5值并在PDF中查找
+
+    :param zip_file: 已打开的固件 ZipFile（由 open_firmware_zip 创建，整个审计期间复用）
+    :param zip_file_path: 固件 ZIP 路径，供并发计算 MD5 的线程各自打开独立句柄
+    """
     test_name = test_images_md5_zip.__name__
     checks = []
-    """验证zip包中.bin和.hpm/.tar文件的MD5值并在PDF中查找"""
-    # 步骤 30: 打开固件 ZIP 包并获取所有文件列表
-    with zipfile.ZipFile(zip_file_path, 'r') as zip_ref:
-        # 获取zip包内的所有文件
-        all_files = zip_ref.namelist()
-        
-        # 步骤 31: 自动识别包含 Release Note.pdf 的子目录名称
-        subdir_name = None
-        for file in all_files:
-            if "Release Note.pdf" in file:
-                subdir_name = file.split("/")[0]
-                break
-        
-        if not subdir_name:
-            checks.append(log_assert(False,f"固件包未找到 Release Note.pdf 文件,Image MD5检查失败",test_name, category="MD5一致性"))
-        
-        # 步骤 32: 提取 Release Note.pdf 以便后续进行 MD5 匹配
-        pdf_path = f"{subdir_name}/Release Note.pdf"
-        if pdf_path in zip_ref.namelist():
-            extracted_pdf_path = zip_ref.extract(pdf_path, path=WORK_DIR)
-        
-            # 步骤 33: 获取子目录下一层级的所有内容，作为候选映像文件列表
-            first_level_contents = [f for f in all_files if f.startswith(f"{subdir_name}/") and len(f.split('/')) == 2]
-        
-            # 步骤 34: 筛选并处理 .bin/.ima/.rom 文件，计算 MD5 并在 PDF 中匹配
-            bin_files = [f for f in first_level_contents if f.lower().endswith(('.bin', '.ima', '.rom'))]
-            if bin_files:
-                bin_file = bin_files[0]
-                extracted_bin_path = zip_ref.extract(bin_file, path=WORK_DIR)
-                actual_bin_md5 = calculate_md5(extracted_bin_path)
+    # 步骤 30: 复用已打开的固件 ZIP 包并获取所有文件列表
+    zip_ref = zip_file
+    # 获取zip包内的所有文件
+    all_files = zip_ref.namelist()
+    all_file_set = set(all_files)
+    
+    # 步骤 31: 自动识别包含 Release Note.pdf 的子目录名称
+    subdir_name = None
+    for file in all_files:
+        if "Release Note.pdf" in file:
+            subdir_name = file.split("/")[0]
+            break
+    
+    if not subdir_name:
+        checks.append(log_assert(False,f"固件包未找到 Release Note.pdf 文件,Image MD5检查失败",test_name, category="MD5一致性"))
+    
+    # 步骤 32: 将 Release Note.pdf 读入内存以便后续进行 MD5 匹配（与工具 MD5 检查共用解析缓存）
+    pdf_path = f"{subdir_name}/Release Note.pdf"
+    if pdf_path in all_file_set:
+        release_note = load_release_note(zip_ref, pdf_path)
+    
+        # 步骤 33: 一次遍历子目录下一层级的内容（恰含一个 '/'，无需 split 分配列表），
+        # 直接归类出候选映像文件
+        subdir_prefix = f"{subdir_name}/"
+        bin_files = []
+        hpm_tar_files = []
+        for f in all_files:
+            if not f.startswith(subdir_prefix) or f.count('/') != 1:
+                continue
+            lower_name = f.lower()
+            if lower_name.endswith(('.bin', '.ima', '.rom')):
+                bin_files.append(f)
+            if lower_name.endswith(('.hpm', '.tar', '.ima_flasher')):
+                hpm_tar_files.append(f)
+
+        # 直接从 ZIP 条目流并发计算目标映像的 MD5（hashlib 计算时会释放 GIL），无需解压落盘；
+        # 每个任务使用独立的 ZipFile 句柄，避免多线程在同一文件对象上争用 seek/read
+        image_files = [files[0] for files in (bin_files, hpm_tar_files) if files]
+        image_md5s = {}
+        if image_files:
+            workers = min(os.cpu_count() or 1, 8, len(image_files))
+            with ThreadPoolExecutor(max_workers=workers) as ex:
+                futures = {f: ex.submit(md5_of_zip_file_member, zip_file_path, f) for f in image_files}
+                image_md5s = {f: future.result() for f, future in futures.items()}
+
+        # 步骤 34: 筛选并处理 .bin/.ima/.rom 文件，计算 MD5 并在 PDF 中匹配
+        if bin_files:
+            bin_file = bin_files[0]
+            actual_bin_md5 = image_md5s[bin_file]
+
+            matches = search_md5_in_pdf_with_pypdf2(release_note, actual_bin_md5)
+            checks.append(log_assert(matches, f"{bin_files} MD5匹配结果{matches}", test_name, category="MD5一致性"))
 
-                matches = search_md5_in_pdf_with_pypdf2(extracted_pdf_path, actual_bin_md5)
-                checks.append(log_assert(matches, f"{bin_files} MD5匹配结果{matches}", test_name, category="MD5一致性"))
+        else:
+            checks.append(log_assert(False,f"固件包未找到.bin或.ima或.rom后缀的文件",test_name, category="MD5一致性"))
+    
+        # 步骤 35: 筛选并处理 .hpm/.tar/.ima_flasher 文件，计算 MD5 并在 PDF 中匹配
+        if hpm_tar_files:
+            hpm_tar_file = hpm_tar_files[0]
+            actual_hpm_tar_md5 = image_md5s[hpm_tar_file]
 
-            else:
-                checks.append(log_assert(False,f"固件包未找到.bin或.ima或.rom后缀的文件",test_name, category="MD5一致性"))
-        
-            # 步骤 35: 筛选并处理 .hpm/.tar/.ima_flasher 文件，计算 MD5 并在 PDF 中匹配
-            hpm_tar_files = [f for f in first_level_contents if f.lower().endswith(('.hpm', '.tar', '.ima_flasher'))]
-            if hpm_tar_files:
-                hpm_tar_file = hpm_tar_files[0]
-                extracted_hpm_tar_path = zip_ref.extract(hpm_tar_file, path=WORK_DIR)
-                actual_hpm_tar_md5 = calculate_md5(extracted_hpm_tar_path)
-
-                matches = search_md5_in_pdf_with_pypdf2(extracted_pdf_path, actual_hpm_tar_md5)
-                checks.append(log_assert(matches, f"{hpm_tar_file} MD5匹配结果{matches}", test_name, category="MD5一致性"))
-            else:
-                checks.append(log_assert(False,f"固件包未找到.hpm或.tar或.ima_flasher后缀的文件",test_name, category="MD5一致性"))
+            matches = search_md5_in_pdf_with_pypdf2(release_note, actual_hpm_tar_md5)
+            checks.append(log_assert(matches, f"{hpm_tar_file} MD5匹配结果{matches}", test_name, category="MD5一致性"))
+        else:
+            checks.append(log_assert(False,f"固件包未找到.hpm或.tar或.ima_flasher后缀的文件",test_name, category="MD5一致性"))
 
 
     return all(checks)
@@ -907,26 +1149,25 @@ def test_flashtool_md5_zip():
     tools = ["InbUpdateTool", "OobUpdateTool"]
     test_name = test_flashtool_md5_zip.__name__
     checks = []
-    # 步骤 26: 打开固件 ZIP，遍历每个工具包并构造 ZIP 与 Release Note 路径
-    with zipfile.ZipFile(FIRMWARE_ZIP, 'r') as zf:
-        for tool in tools:
-            zip_path = f"{root_dir}/{tool}.zip"
-            pdf_path = f"{root_dir}/Release Note.pdf"
-            if pdf_path in zf.namelist():
-                if zip_path in zf.namelist():
-                    try:
-                        # 步骤 27: 提取运维工具 ZIP 与 Release Note.pdf 到本地
-                        extracted_tool_path = zf.extract(zip_path, path=WORK_DIR)
-                        extracted_pdf_path = zf.extract(pdf_path, path=WORK_DIR)
-                        # 步骤 28: 计算工具 ZIP 的 MD5 并在 Release Note.pdf 中查找匹配
-                        actual_tool_md5 = calculate_md5(extracted_tool_path)
-                        matches = search_md5_in_pdf_with_pypdf2(extracted_pdf_path, actual_tool_md5)
-                        checks.append(log_assert(matches, f"{tool} MD5匹配结果{matches}", test_name, category="MD5一致性"))
-                    except Exception as e:
-                        raise ValueError(f"处理{tool}时失败：{str(e)}") from e
-            else:
-                # 步骤 29: 若缺少 Release Note.pdf，则记录当前工具 MD5 校验失败
-                checks.append(log_assert(False,f"固件包未找到{pdf_path}文件,UpdateTool MD5检查失败",test_name, category="MD5一致性"))
+    # 步骤 26: 复用已打开的固件 ZIP，遍历每个工具包并构造 ZIP 与 Release Note 路径
+    zf = ZIP_HANDLE
+    for tool in tools:
+        zip_path = f"{root_dir}/{tool}.zip"
+        pdf_path = f"{root_dir}/Release Note.pdf"
+        if pdf_path in ZIP_NAMES:
+            if zip_path in ZIP_NAMES:
+                try:
+                    # 步骤 27: 将 Release Note.pdf 读入内存（每次审计只读取一次；工具 ZIP 直接从条目流计算 MD5）
+                    release_note = load_release_note(zf, pdf_path)
+                    # 步骤 28: 计算工具 ZIP 的 MD5 并在 Release Note.pdf 中查找匹配
+                    actual_tool_md5 = md5_of_zip_member(zf, zip_path)
+                    matches = search_md5_in_pdf_with_pypdf2(release_note, actual_tool_md5)
+                    checks.append(log_assert(matches, f"{tool} MD5匹配结果{matches}", test_name, category="MD5一致性"))
+                except Exception as e:
+                    raise ValueError(f"处理{tool}时失败：{str(e)}") from e
+        else:
+            # 步骤 29: 若缺少 Release Note.pdf，则记录当前工具 MD5 校验失败
+            checks.append(log_assert(False,f"固件包未找到{pdf_path}文件,UpdateTool MD5检查失败",test_name, category="MD5一致性"))
 
 
     return all(checks)
@@ -934,7 +1175,6 @@ def test_flashtool_md5_zip():
 
 
 def run_all_tests() -> None:
-    # 使用字典管理每个测试函数及其参数
     if FW_TYPE == "BMC":
         first_level_files = BMCfirst_level_files
         second_level_files = BMCsecond_level_files
@@ -945,59 +1185,46 @@ def run_all_tests() -> None:
         second_level_files = BIOSsecond_level_files
         second_level_files_report = BIOSsecond_level_files_report
         third_level_files = BIOSthird_level_files
+    # 非首次提交（submit=False）时不检查 _Full_Test_Report，直接传入空列表
+    if not submit:
+        second_level_files_report = []
+
+    # 按执行顺序排列的 (测试函数, 参数) 列表；同一函数需多次调用时重复列出
+    test_plan = (
+        (test_firmware_naming, ()),
+        (test_files_in_zip, (ZIP_NAMES,)),
+        (test_paths_in_zip, (ZIP_NAMES, first_level_files, "一")),
+        (test_paths_in_zip, (ZIP_NAMES, second_level_files, "二")),
+        (test_paths_in_zip, (ZIP_NAMES, second_level_files_report, "二", logging.WARNING)),
+        (test_paths_in_zip, (ZIP_NAMES, third_level_files, "三")),
+        (test_operation_tool, ()),
+        (test_flashtool_md5_zip, ()),
+        (test_images_md5_zip, (ZIP_HANDLE, FIRMWARE_ZIP)),
+    )
 
-    test_configs = {
-        test_firmware_naming: {},
-        test_files_in_zip: {
-            "args": (FIRMWARE_ZIP,)
-        },
-        test_paths_in_zip: [
-            {
-                "args": (FIRMWARE_ZIP, first_level_files, replace_map, "一")
-            },
-
-            {
-                "args": (FIRMWARE_ZIP, second_level_files, replace_map, "二")
-            },
-            {
-                "args": (FIRMWARE_ZIP, second_level_files_report, replace_map, "二", logging.WARNING)
-            },
-            {
-                "args": (FIRMWARE_ZIP, third_level_files, replace_map, "三")
-            }
-        ],
-        test_operation_tool: {},
-        test_flashtool_md5_zip: {},
-        test_images_md5_zip: {
-            "args": (FIRMWARE_ZIP,)
-        },
-        
-    }
-    
-    for test_func, config in test_configs.items():
-        test_name = test_func.__name__
-        
+    for test_func, args in test_plan:
         try:
-            if isinstance(config, list):
-                # 处理需要多次调用的函数
-                for i, sub_config in enumerate(config):
-                    test_func(*sub_config["args"])
-            else:
-                # 处理单次调用的函数
-                args = config.get("args", ())
-                test_func(*args)
-                
+            test_func(*args)
         except Exception as e:
-            print(f"ERROR: 测试 {test_name} 异常: {str(e)}")
+            print(f"ERROR: 测试 {test_func.__name__} 异常: {str(e)}")
+    # 逐行流式读取日志，一次遍历完成计数与告警/错误行收集
+    pass_count = warning_count = failed_count = 0
+    error_line = []
+    warning_lines = []
     with open(log_file, 'r', encoding='utf-8') as f:
-        log_content = f.read()
-
-    log_lines = log_content.splitlines()
-    total = log_content.count("[PASS]") + log_content.count("[WARNING]") + log_content.count("[ERROR]")
-    failed_count = log_content.count("[ERROR]")
+        for line in f:
+            pass_count += line.count("[PASS]")
+            n_warning = line.count("[WARNING]")
+            n_error = line.count("[ERROR]")
+            warning_count += n_warning
+            failed_count += n_error
+            if n_error:
+                error_line.append(line.rstrip('\n'))
+            if n_warning:
+                warning_lines.append(line.rstrip('\n'))
+
+    total = pass_count + warning_count + failed_count
     passed_count = total - failed_count
-    error_line = [line for line in log_lines if 'ERROR' in line and '[ERROR]' in line]
-    warning_lines = [line for line in log_lines if 'WARNING' in line and '[WARNING]' in line]
     # 输出汇总结果
     print("==================== 测试汇总 ======================\n")
     print(f"MANUFACTURER:{MANUFACTURER} ")
@@ -1018,6 +1245,8 @@ def run_all_tests() -> None:
             print(f"告警信息：{line}")
 
 def finalize_audit() -> None:
+    # 先落盘剩余的日志与检查项，保证审计状态更新时报告数据已完整
+    _flush_mongo()
     if MONGO_DB is None:
         print("[Mongo] finalize_audit 跳过：MONGO_DB 为空")
         return
@@ -1047,15 +1276,8 @@ def finalize_audit() -> None:
         print(f"[Mongo] 写入 audits 失败: {e}")
 if __name__ == "__main__":
     try:
-        with zipfile.ZipFile(FIRMWARE_ZIP, 'r') as zf:
-            namelist = zf.namelist()
-            run_all_tests()
-            print_zip_tree(FIRMWARE_ZIP, namelist, log_file)
-            finalize_audit()
+        run_all_tests()
+        print_zip_tree(FIRMWARE_ZIP, list(ZIP_INFOS), log_file)
+        finalize_audit()
     except Exception as e:
         print(f"无法读取ZIP文件: {e}")
-    finally:
-        try:
-            shutil.rmtree(WORK_DIR, ignore_errors=True)
-        except Exception:
-            pass
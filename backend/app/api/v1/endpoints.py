@@ -1,19 +1,70 @@
+import hashlib
+import logging
+import threading
+import time
+from typing import Any
+
 from fastapi import APIRouter, UploadFile, File, HTTPException, status, Form, BackgroundTasks, Query, Request, Depends, Response
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse
 from pydantic import BaseModel
-from pymongo import MongoClient
+from pymongo import ASCENDING, DESCENDING, MongoClient
+from pymongo.errors import ConnectionFailure
 
 from app.audit_service import AuditService
 from app.auth_service import AuthService
-from app.core.config import settings
+from app.core.cache import TTLCache
+from app.core.config import SESSION_CACHE_TTL_SECONDS, settings
 
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 
 _mongo_client: MongoClient | None = None
 
 
+# 各接口高频查询所需的索引：(集合, 索引键, create_index 额外参数)
+# - audits: 按 id 精确查询；列表按 userId(+firmwareType) 过滤并按 (createdAt, id) 倒序分页
+# - audit_logs: 按 auditId 过滤并按 timestamp 排序/增量拉取
+# - audit_checks: 按 auditId 聚合报告
+# - audit_uploads / sessions / users: 按各自的唯一键查询
+_MONGO_INDEXES: list[tuple[str, list[tuple[str, int]], dict[str, Any]]] = [
+    ("audits", [("id", ASCENDING)], {"unique": True}),
+    ("audits", [("userId", ASCENDING), ("createdAt", DESCENDING), ("id", DESCENDING)], {}),
+    (
+        "audits",
+        [("userId", ASCENDING), ("firmwareType", ASCENDING), ("createdAt", DESCENDING), ("id", DESCENDING)],
+        {},
+    ),
+    ("audit_logs", [("auditId", ASCENDING), ("timestamp", ASCENDING)], {}),
+    ("audit_checks", [("auditId", ASCENDING)], {}),
+    ("audit_uploads", [("uploadId", ASCENDING)], {"unique": True}),
+    ("sessions", [("sessionId", ASCENDING)], {"unique": True}),
+    ("users", [("itcode", ASCENDING)], {"unique": True}),
+]
+
+_mongo_client_lock = threading.Lock()
+
+
+def ensure_mongo_indexes() -> None:
+    """
+    创建各接口所需索引（create_index 幂等，已存在时不会重复创建）。
+
+    每个索引单独创建：索引只影响查询性能，某一个失败（如权限不足、已有重复数据）
+    只记录日志，不影响其余索引与服务运行。数据库不可达时直接放弃，避免每个索引各等待一次服务器选择超时。
+    """
+    db = get_mongo_db()
+    for collection, keys, options in _MONGO_INDEXES:
+        try:
+            db[collection].create_index(keys, **options)
+        except ConnectionFailure as exc:
+            logger.error("MongoDB 不可达，跳过索引创建: %s", exc)
+            return
+        except Exception as exc:  # noqa: BLE001
+            logger.error("创建 MongoDB 索引失败 %s %s: %s", collection, keys, exc)
+
+
 def get_mongo_db():
     """
     返回一个可复用的 MongoDB 数据库句柄。
@@ -22,13 +73,38 @@ def get_mongo_db():
     - 快速定位并修改连接 URI
     - 快速定位并修改数据库名称
     - 统一管理客户端复用策略
+
+    创建 MongoClient 不会阻塞等待连接；索引由 ensure_mongo_indexes 在应用启动后台创建。
     """
     global _mongo_client
     if _mongo_client is None:
-        _mongo_client = MongoClient(settings.MONGO_URI)
+        # 同步端点在线程池中并发执行，加锁保证只创建一个客户端
+        with _mongo_client_lock:
+            if _mongo_client is None:
+                _mongo_client = MongoClient(
+                    settings.MONGO_URI,
+                    maxPoolSize=settings.MONGO_MAX_POOL_SIZE,
+                    minPoolSize=settings.MONGO_MIN_POOL_SIZE,
+                    maxIdleTimeMS=settings.MONGO_MAX_IDLE_TIME_MS or None,
+                )
     return _mongo_client[settings.MONGO_DB_NAME]
 
 
+# 说明：
+# - AuditService / AuthService 使用同步 PyMongo。只调用同步服务方法的端点声明为普通 def，
+#   由 FastAPI 放入线程池执行，避免阻塞事件循环；并发度受 MONGO_MAX_POOL_SIZE 连接池约束。
+# - 返回 JSON 的端点均声明返回类型，FastAPI 据此由 Pydantic 直接序列化为 JSON 字节，
+#   跳过 jsonable_encoder 的逐字段转换与标准库 json.dumps。
+
+
+def close_mongo_client() -> None:
+    """关闭共享的 MongoClient（如已创建），供应用关闭时调用。"""
+    global _mongo_client
+    if _mongo_client is not None:
+        _mongo_client.close()
+        _mongo_client = None
+
+
 def get_audit_service() -> AuditService:
     db = get_mongo_db()
     return AuditService(db)
@@ -61,10 +137,30 @@ class OALoginRequest(BaseModel):
     next: str | None = None
 
 
+# 已校验会话的短期缓存：sha256(token) -> itcode
+# 同一会话在 SESSION_CACHE_TTL_SECONDS 内（且不超过会话自身的 expiresAt）的后续请求不再查询 sessions 集合；
+# 用户资料不放在这里，而是每次经 AuthService 的资料缓存读取，OA 回调更新资料后现有会话也能立即看到
+_session_cache = TTLCache(maxsize=4096)
+
+
 def get_current_user(request: Request) -> dict:
-    service = get_auth_service()
     token = request.headers.get("X-Session-Token")
-    return service.require_login(token)
+    key = hashlib.sha256(token.encode("utf-8")).digest() if token else None
+    service = get_auth_service()
+    if key is not None:
+        itcode = _session_cache.get(key)
+        if itcode is not None:
+            return service.build_current_user(token, itcode)
+
+    user, expires_ts = service.require_login_with_expiry(token)
+
+    ttl = float(SESSION_CACHE_TTL_SECONDS)
+    if expires_ts is not None:
+        # 缓存不能比会话本身活得更久，否则会话过期后仍能通过校验
+        ttl = min(ttl, expires_ts - time.time())
+    if key is not None and user["itcode"] is not None:
+        _session_cache.set(key, user["itcode"], ttl)
+    return user
 
 
 @router.post(
@@ -80,7 +176,7 @@ async def create_audit(
     version: str | None = Form(None),
     bmcType: str = Form("OpenBMC"),
     checkScript: str = Form("CheckFWFile_v1.3.1.py"),
-):
+) -> dict[str, Any]:
     """
     创建新的固件审计任务。
 
@@ -98,14 +194,14 @@ async def create_audit(
         user_id=current_user.get("itcode"),
         user_name=current_user.get("user", {}).get("name"),
     )
-    return JSONResponse(status_code=status.HTTP_201_CREATED, content=response_body)
+    return response_body
 
 
 @router.post("/audits/chunk-init")
-async def init_audit_chunk_upload(
+def init_audit_chunk_upload(
     payload: ChunkInitRequest,
     current_user: dict = Depends(get_current_user),
-):
+) -> dict[str, Any]:
     service = get_audit_service()
     data = service.init_chunked_audit_upload(
         original_filename=payload.fileName,
@@ -149,17 +245,17 @@ async def complete_audit_chunk_upload(
     payload: ChunkCompleteRequest,
     background_tasks: BackgroundTasks,
     current_user: dict = Depends(get_current_user),
-):
+) -> dict[str, Any]:
     service = get_audit_service()
     response_body = await service.finalize_chunked_audit_upload(
         background_tasks=background_tasks,
         upload_id=payload.uploadId,
     )
-    return JSONResponse(status_code=status.HTTP_201_CREATED, content=response_body)
+    return response_body
 
 
 @router.post("/auth/oa/callback")
-async def oa_login_callback(payload: OALoginRequest):
+def oa_login_callback(payload: OALoginRequest) -> dict[str, Any]:
     service = get_auth_service()
     return service.handle_oa_callback(
         status_value=payload.status,
@@ -169,24 +265,25 @@ async def oa_login_callback(payload: OALoginRequest):
 
 
 @router.get("/auth/me")
-async def get_me(current_user: dict = Depends(get_current_user)):
+async def get_me(current_user: dict = Depends(get_current_user)) -> dict[str, Any]:
     return current_user
 
 
 @router.get("/audits")
-async def list_audits(
+def list_audits(
     status: list[str] | None = Query(None),
     firmwareType: str | None = Query(None),
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    before: str | None = Query(None),
     current_user: dict = Depends(get_current_user),
-):
+) -> dict[str, Any]:
     """
     查询审计任务历史列表。
 
     - 支持按状态和固件类型筛选
     - 按创建时间倒序
-    - 使用 limit/offset 进行分页
+    - 使用 limit/offset 进行分页；也可传入上一页返回的 nextCursor 作为 before 进行游标分页
     """
     service = get_audit_service()
     return service.list_audits(
@@ -195,14 +292,15 @@ async def list_audits(
         limit=limit,
         offset=offset,
         user_id=current_user.get("itcode"),
+        before=before,
     )
 
 
 @router.get("/audits/{audit_id}")
-async def get_audit(
+def get_audit(
     audit_id: str,
     current_user: dict = Depends(get_current_user),
-):
+) -> dict[str, Any]:
     """
     根据审计 ID 获取单条审计文档。
 
@@ -216,34 +314,47 @@ async def get_audit(
 
 
 @router.get("/audits/{audit_id}/logs")
-async def get_audit_logs(
+def get_audit_logs(
     audit_id: str,
     current_user: dict = Depends(get_current_user),
     limit: int = Query(200, ge=1, le=1000),
     since: str | None = None,
-):
+    fields: list[str] | None = Query(None),
+) -> list[dict[str, Any]]:
     """
     按时间顺序返回指定审计任务的“控制台风格”日志记录。
 
     - limit 控制返回的日志条数上限（范围为 1..1000）
     - 当提供 since 时，会以 $gt 方式与 timestamp 字段比较做增量拉取
+    - 当提供 fields 时（可重复，如 ?fields=message&fields=level），只返回这些字段
     """
     service = get_audit_service()
-    return service.get_audit_logs(audit_id=audit_id, limit=limit, since=since)
+    return service.get_audit_logs(audit_id=audit_id, limit=limit, since=since, fields=fields)
 
 
 @router.get("/audits/{audit_id}/report")
-async def get_audit_report(
+def get_audit_report(
     audit_id: str,
     current_user: dict = Depends(get_current_user),
-):
+    includeChecks: bool = Query(True),
+    checksOffset: int = Query(0, ge=0),
+    checksLimit: int | None = Query(None, ge=1, le=1000),
+) -> dict[str, Any]:
     """
     基于审计主文档与检查结果集合构建一份“综合审计报告”视图。
 
+    - includeChecks=false 时只返回报告头部与 summary，不加载检查结果
+    - 提供 checksOffset / checksLimit 时对检查结果分页，并在响应中附带 checksTotal
+
     具体的组合逻辑由业务服务实现，本端点负责 HTTP 协议层的行为定义。
     """
     service = get_audit_service()
-    report = service.get_audit_report(audit_id)
+    report = service.get_audit_report(
+        audit_id,
+        include_checks=includeChecks,
+        checks_offset=checksOffset,
+        checks_limit=checksLimit,
+    )
     if report is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Audit not found")
     return report
@@ -252,6 +363,7 @@ async def get_audit_report(
 @router.get("/audits/{audit_id}/report.pdf")
 async def get_audit_report_pdf(
     audit_id: str,
+    request: Request,
     current_user: dict = Depends(get_current_user),
 ):
     """
@@ -263,18 +375,29 @@ async def get_audit_report_pdf(
       并将生成结果保存在 FWAUDIT_REPORT_DIR 目录下。
     - 后续访问时：
       若磁盘上已存在对应文件，则直接读取并通过 FileResponse 返回给前端。
+    - 缓存文件按报告内容区分，审计结果更新后会重新生成；渲染在独立进程池中完成，不阻塞事件循环。
 
     注意：
     - 若指定的审计任务不存在，则返回 404。
     - 媒体类型固定为 application/pdf，前端可选择直接预览或下载。
+    - 响应携带基于报告内容的 ETag；请求头 If-None-Match 与之相同时直接返回 304，
+      不再重新渲染与传输 PDF。
     """
     service = get_audit_service()
-    pdf_path = service.generate_audit_report_pdf(audit_id)
-    if pdf_path is None:
+    report = await run_in_threadpool(service.get_audit_report, audit_id)
+    if report is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Audit not found")
+    # 序列化整份报告计算摘要，检查项较多时耗时明显，放到线程池执行
+    etag = await run_in_threadpool(service.compute_report_etag, report)
+    cache_headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers)
+
+    pdf_path = await service.generate_audit_report_pdf(audit_id, report=report, etag=etag)
     filename = f"audit-{audit_id}.pdf"
     return FileResponse(
         pdf_path,
         media_type="application/pdf",
         filename=filename,
+        headers=cache_headers,
     )
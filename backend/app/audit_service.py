@@ -1,19 +1,87 @@
+import asyncio
+import base64
+import hashlib
+import json
 import logging
+import multiprocessing
 import os
-import subprocess
+import re
+import shutil
 import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 from typing import Any
 
 from fastapi import BackgroundTasks, HTTPException, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
 
-from app.core.config import settings
-from app.pdf_report import generate_audit_report_pdf_file
+from app.core.config import FWAUDIT_SCRIPT_TIMEOUT, PYTHON_EXECUTABLE, settings
+from app.pdf_report import generate_audit_report_pdf_file, report_pdf_path
 
 
 logger = logging.getLogger(__name__)
 
+# 运行期不会变化的路径配置，在模块导入时解析一次
+FWAUDIT_UPLOAD_DIR = Path(settings.FWAUDIT_UPLOAD_DIR)
+FWAUDIT_CHUNK_ROOT = FWAUDIT_UPLOAD_DIR / "chunk_uploads"
+DEFAULT_SCRIPT_PATH = Path(settings.FWAUDIT_SCRIPT_PATH)
+DEFAULT_SCRIPT_BASE = DEFAULT_SCRIPT_PATH.resolve().parent
+DEFAULT_SCRIPT_NAME = DEFAULT_SCRIPT_PATH.name
+
+# 客户端文件名中的路径分隔符（同时处理 POSIX 与 Windows 风格）
+_PATH_SEP_RE = re.compile(r"[\\/]")
+
+# 报告展示统一使用的东八区时区
+_TZ_CN = timezone(timedelta(hours=8))
+
+
+def _safe_zip_name(name: str) -> str:
+    """
+    取客户端文件名的最后一段作为落盘文件名，并保证以 .zip 结尾。
+    """
+    base = _PATH_SEP_RE.split(name)[-1]
+    return base if base.lower().endswith(".zip") else f"{base}.zip"
+
+
+# PDF 渲染（ReportLab 排版）为 CPU 密集型任务，交由独立进程池执行，首次使用时创建
+_pdf_pool: ProcessPoolExecutor | None = None
+
+
+def _get_pdf_pool() -> ProcessPoolExecutor:
+    global _pdf_pool
+    if _pdf_pool is None:
+        # 服务进程为多线程环境，使用 spawn 启动子进程以避免 fork 继承锁状态
+        _pdf_pool = ProcessPoolExecutor(
+            max_workers=settings.FWAUDIT_PDF_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pdf_pool
+
+
+def shutdown_pdf_pool() -> None:
+    """关闭 PDF 渲染进程池（如已创建），供应用关闭时调用。"""
+    global _pdf_pool
+    if _pdf_pool is not None:
+        _pdf_pool.shutdown(wait=True, cancel_futures=True)
+        _pdf_pool = None
+
+
+# 审计历史列表只返回前端列表视图需要的字段（与前端 AuditTask 类型对应）
+AUDIT_LIST_PROJECTION = {
+    "_id": 0,
+    "id": 1,
+    "status": 1,
+    "createdAt": 1,
+    "completedAt": 1,
+    "firmwareType": 1,
+    "productName": 1,
+    "version": 1,
+    "summary": 1,
+    "userId": 1,
+    "userName": 1,
+}
+
 
 class AuditService:
     """
@@ -47,17 +115,97 @@ class AuditService:
         if not value:
             return None
         raw = str(value)
-        if raw.endswith("Z"):
-            raw = raw[:-1] + "+00:00"
         try:
             dt = datetime.fromisoformat(raw)
         except Exception:
             return raw
         if dt.tzinfo is None:
             dt = dt.replace(tzinfo=timezone.utc)
-        dt_local = dt.astimezone(timezone(timedelta(hours=8)))
+        dt_local = dt.astimezone(_TZ_CN)
         return dt_local.strftime("%Y-%m-%d %H:%M:%S")
 
+    @staticmethod
+    def _save_upload_file(upload: UploadFile, target_path: Path) -> None:
+        """
+        将上传文件的内容完整写入 target_path。
+
+        FastAPI 已将请求体落盘为 SpooledTemporaryFile，这里直接对其底层文件对象做一次
+        4 MiB 缓冲的 shutil.copyfileobj，而不是在事件循环中逐块 await read。
+        该过程为同步磁盘 I/O，异步调用方应通过 run_in_threadpool 执行。
+        """
+        upload.file.seek(0)
+        with target_path.open("wb") as dest:
+            shutil.copyfileobj(upload.file, dest, 4 * 1024 * 1024)
+
+    @staticmethod
+    def _copy_file_at(dest_fd: int, src_path: Path, offset: int) -> None:
+        """
+        将 src_path 的全部内容写入 dest_fd 中从 offset 开始的位置。
+
+        使用位置写入（不依赖、也不修改文件指针），可被多个线程并发调用。
+        优先使用 os.copy_file_range 在内核态完成拷贝（无需经过用户态缓冲区），
+        平台或文件系统不支持时退回 1 MiB 缓冲的 pread/pwrite。
+        """
+        with src_path.open("rb", buffering=0) as src:
+            src_fd = src.fileno()
+            size = os.fstat(src_fd).st_size
+            copied = 0
+            if hasattr(os, "copy_file_range"):
+                try:
+                    while copied < size:
+                        n = os.copy_file_range(src_fd, dest_fd, size - copied, copied, offset + copied)
+                        if n == 0:
+                            break
+                        copied += n
+                except OSError:
+                    # 例如跨文件系统或内核不支持，从已拷贝的位置继续普通拷贝
+                    pass
+            while copied < size:
+                data = os.pread(src_fd, min(1024 * 1024, size - copied), copied)
+                if not data:
+                    break
+                view = memoryview(data)
+                while view:
+                    written = os.pwrite(dest_fd, view, offset + copied)
+                    view = view[written:]
+                    copied += written
+
+    @classmethod
+    def _merge_chunks(cls, target_path: Path, chunk_dir: Path, total_chunks: int) -> None:
+        """
+        按分片序号将 chunk_dir 下的全部分片合并写入 target_path。
+
+        - 各分片在目标文件中的偏移量由前序分片的实际大小累加得到
+        - 先按总大小预分配目标文件，再由线程池并发地将各分片写入各自的偏移位置
+
+        该过程为同步磁盘 I/O，异步调用方应通过 run_in_threadpool 执行，避免阻塞事件循环。
+        """
+        part_paths = [chunk_dir / f"{index:06d}.part" for index in range(total_chunks)]
+        offsets = []
+        total_size = 0
+        for part_path in part_paths:
+            offsets.append(total_size)
+            total_size += part_path.stat().st_size
+
+        fd = os.open(target_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            if total_size > 0:
+                try:
+                    os.posix_fallocate(fd, 0, total_size)
+                except (AttributeError, OSError):
+                    # 平台或文件系统不支持预分配时，由 truncate 仅设置文件长度
+                    os.ftruncate(fd, total_size)
+            workers = min(os.cpu_count() or 1, 8, total_chunks)
+            if workers <= 1:
+                for part_path, offset in zip(part_paths, offsets):
+                    cls._copy_file_at(fd, part_path, offset)
+            else:
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    # list() 使任一分片的异常在此处重新抛出
+                    list(executor.map(lambda args: cls._copy_file_at(fd, *args), zip(part_paths, offsets)))
+        finally:
+            os.close(fd)
+
     def _mark_audit_failed(self, audit_id: str, reason: str) -> None:
         """
         当后台处理失败时，尽最大努力更新对应审计任务的文档。
@@ -79,29 +227,31 @@ class AuditService:
         except Exception as exc:  # noqa: BLE001
             logger.error("标记审计任务 %s 失败状态时出错: %s", audit_id, exc)
 
-    def run_check_script(self, audit_id: str, zip_path: str, bmc_type: str) -> None:
+    async def run_check_script(self, audit_id: str, zip_path: str, bmc_type: str) -> None:
         """
         为指定审计任务执行外部固件检查脚本。
 
         优先根据审计文档上记录的脚本名称选择脚本，
         若未指定则回退到全局配置的默认脚本路径。
+
+        脚本以 asyncio 子进程方式运行并在事件循环上等待其结束，
+        不会在整个脚本运行期间占用线程池中的工作线程。
         """
-        audit = self.db["audits"].find_one({"id": audit_id}, {"checkScript": 1})
+        audit = await run_in_threadpool(self.db["audits"].find_one, {"id": audit_id}, {"checkScript": 1})
         script_name = (audit or {}).get("checkScript")
 
         if script_name:
-            base_dir = Path(settings.FWAUDIT_SCRIPT_PATH).resolve().parent
-            script_path = base_dir / script_name
+            script_path = DEFAULT_SCRIPT_BASE / script_name
         else:
-            script_path = Path(settings.FWAUDIT_SCRIPT_PATH)
+            script_path = DEFAULT_SCRIPT_PATH
         if not script_path.is_file():
             reason = f"检查脚本不存在: {script_path}"
             logger.error("[audit %s] %s", audit_id, reason)
-            self._mark_audit_failed(audit_id, reason)
+            await run_in_threadpool(self._mark_audit_failed, audit_id, reason)
             return
 
         cmd = [
-            settings.PYTHON_EXECUTABLE,
+            PYTHON_EXECUTABLE,
             str(script_path),
             "-f",
             zip_path,
@@ -111,20 +261,26 @@ class AuditService:
             audit_id,
         ]
 
+        reason = None
+        proc = None
         try:
-            subprocess.run(cmd, check=True, timeout=settings.FWAUDIT_SCRIPT_TIMEOUT)
-        except subprocess.TimeoutExpired:
-            reason = f"检查脚本在 {settings.FWAUDIT_SCRIPT_TIMEOUT} 秒后超时"
-            logger.error("[audit %s] %s", audit_id, reason)
-            self._mark_audit_failed(audit_id, reason)
-        except subprocess.CalledProcessError as exc:  # noqa: BLE001
-            reason = f"检查脚本以非零退出码结束: {exc.returncode}"
-            logger.error("[audit %s] %s", audit_id, reason)
-            self._mark_audit_failed(audit_id, reason)
+            proc = await asyncio.create_subprocess_exec(*cmd)
+            returncode = await asyncio.wait_for(proc.wait(), timeout=FWAUDIT_SCRIPT_TIMEOUT)
+            if returncode != 0:
+                reason = f"检查脚本以非零退出码结束: {returncode}"
+        except asyncio.TimeoutError:
+            reason = f"检查脚本在 {FWAUDIT_SCRIPT_TIMEOUT} 秒后超时"
         except Exception as exc:  # noqa: BLE001
             reason = f"检查脚本执行异常: {exc}"
+        finally:
+            # 超时或任务被取消时结束子进程，避免遗留孤儿进程
+            if proc is not None and proc.returncode is None:
+                proc.kill()
+                await proc.wait()
+
+        if reason is not None:
             logger.error("[audit %s] %s", audit_id, reason)
-            self._mark_audit_failed(audit_id, reason)
+            await run_in_threadpool(self._mark_audit_failed, audit_id, reason)
 
     async def create_audit(
         self,
@@ -156,41 +312,28 @@ class AuditService:
 
         audit_id = uuid.uuid4().hex
 
-        upload_base = Path(settings.FWAUDIT_UPLOAD_DIR)
-        upload_base.mkdir(parents=True, exist_ok=True)
-        upload_dir = upload_base / audit_id
+        upload_dir = FWAUDIT_UPLOAD_DIR / audit_id
         upload_dir.mkdir(parents=True, exist_ok=True)
 
-        safe_name = os.path.basename(original_filename)
-        safe_name = safe_name.replace(os.sep, "_")
-        if os.altsep:
-            safe_name = safe_name.replace(os.altsep, "_")
-        if not safe_name.lower().endswith(".zip"):
-            safe_name = f"{safe_name}.zip"
+        safe_name = _safe_zip_name(original_filename)
 
         target_path = upload_dir / safe_name
 
         try:
-            with target_path.open("wb") as f:
-                while True:
-                    chunk = await file.read(1024 * 1024)
-                    if not chunk:
-                        break
-                    f.write(chunk)
+            await run_in_threadpool(self._save_upload_file, file, target_path)
         except Exception as exc:  # noqa: BLE001
             logger.error("[audit %s] 持久化上传文件失败: %s", audit_id, exc)
-            if target_path.exists():
-                try:
-                    target_path.unlink()
-                except Exception:  # noqa: BLE001
-                    pass
+            try:
+                target_path.unlink(missing_ok=True)
+            except Exception:  # noqa: BLE001
+                pass
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to store uploaded file",
             ) from exc
 
         now = self._utc_now_iso()
-        effective_script_name = script_name or Path(settings.FWAUDIT_SCRIPT_PATH).name
+        effective_script_name = script_name or DEFAULT_SCRIPT_NAME
         audit_doc = {
             "id": audit_id,
             "status": "PENDING",
@@ -210,14 +353,15 @@ class AuditService:
             },
         }
         try:
-            self.db["audits"].update_one({"id": audit_id}, {"$set": audit_doc}, upsert=True)
+            await run_in_threadpool(
+                self.db["audits"].update_one, {"id": audit_id}, {"$set": audit_doc}, upsert=True
+            )
         except Exception as exc:  # noqa: BLE001
             logger.error("[audit %s] 初始化审计文档失败: %s", audit_id, exc)
-            if target_path.exists():
-                try:
-                    target_path.unlink()
-                except Exception:  # noqa: BLE001
-                    pass
+            try:
+                target_path.unlink(missing_ok=True)
+            except Exception:  # noqa: BLE001
+                pass
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to initialize audit task",
@@ -246,46 +390,108 @@ class AuditService:
         """
         return self.db["audits"].find_one({"id": audit_id}, {"_id": 0})
 
-    def get_audit_logs(self, audit_id: str, limit: int, since: str | None) -> list[dict]:
+    def get_audit_logs(
+        self,
+        audit_id: str,
+        limit: int,
+        since: str | None,
+        fields: list[str] | None = None,
+    ) -> list[dict]:
         """
         获取指定审计任务的日志列表。
 
         - limit 控制返回的最大条数
         - since 用于基于 timestamp 字段的增量拉取
+        - fields 指定时只返回这些字段，未指定时返回完整日志记录
         """
         query: dict[str, Any] = {"auditId": audit_id}
         if since:
             query["timestamp"] = {"$gt": since}
+        projection: dict[str, int] = {"_id": 0}
+        if fields:
+            projection.update({field: 1 for field in fields if field != "_id"})
         cursor = (
             self.db["audit_logs"]
-            .find(query, {"_id": 0})
+            .find(query, projection)
             .sort("timestamp", 1)
             .limit(limit)
         )
         return list(cursor)
 
-    def get_audit_report(self, audit_id: str) -> dict | None:
+    def get_audit_report(
+        self,
+        audit_id: str,
+        include_checks: bool = True,
+        checks_offset: int = 0,
+        checks_limit: int | None = None,
+    ) -> dict | None:
         """
         基于审计主文档与检查结果集合构建一份“综合审计报告”视图。
 
+        - include_checks 为 False 时只返回报告头部与 summary，不加载检查结果
+        - 指定 checks_offset / checks_limit 时只返回该页检查结果，并附带 checksTotal 总数
+
         若对应审计不存在则返回 None，由上层负责返回 404。
         """
-        checks_cursor = self.db["audit_checks"].find({"auditId": audit_id}, {"_id": 0})
-        checks = list(checks_cursor)
-        audit = self.db["audits"].find_one({"id": audit_id}, {"_id": 0})
+        # 单次聚合同时取回审计主文档与其检查结果，避免两次往返
+        pipeline: list[dict[str, Any]] = [
+            {"$match": {"id": audit_id}},
+            {"$limit": 1},
+            {
+                "$project": {
+                    "_id": 0,
+                    "id": 1,
+                    "createdAt": 1,
+                    "completedAt": 1,
+                    "firmwareType": 1,
+                    "productName": 1,
+                    "version": 1,
+                    "summary": 1,
+                }
+            },
+        ]
+        paginate = include_checks and (checks_offset > 0 or checks_limit is not None)
+        if include_checks:
+            pipeline.append(
+                {
+                    "$lookup": {
+                        "from": "audit_checks",
+                        "localField": "id",
+                        "foreignField": "auditId",
+                        "as": "checks",
+                    }
+                }
+            )
+            pipeline.append({"$project": {"checks._id": 0}})
+        if paginate:
+            # $slice 的条数参数必须为正数，未指定 limit 时取到数组末尾
+            count = checks_limit if checks_limit is not None else {"$max": [{"$size": "$checks"}, 1]}
+            pipeline.append(
+                {
+                    "$set": {
+                        "checksTotal": {"$size": "$checks"},
+                        "checks": {"$slice": ["$checks", checks_offset, count]},
+                    }
+                }
+            )
+        audit = next(self.db["audits"].aggregate(pipeline), None)
         if not audit:
             return None
         raw_timestamp = audit.get("completedAt") or audit.get("createdAt")
         friendly_timestamp = self._format_timestamp_local(raw_timestamp)
-        return {
+        report = {
             "id": audit_id,
             "timestamp": friendly_timestamp or raw_timestamp,
             "firmwareType": audit.get("firmwareType"),
             "productName": audit.get("productName"),
             "version": audit.get("version"),
             "summary": audit.get("summary", {}),
-            "checks": checks,
         }
+        if include_checks:
+            report["checks"] = audit.get("checks", [])
+        if paginate:
+            report["checksTotal"] = audit.get("checksTotal", 0)
+        return report
 
     def init_chunked_audit_upload(
         self,
@@ -308,18 +514,11 @@ class AuditService:
             )
 
         base_name = original_filename or "firmware.zip"
-        safe_name = os.path.basename(base_name)
-        safe_name = safe_name.replace(os.sep, "_")
-        if os.altsep:
-            safe_name = safe_name.replace(os.altsep, "_")
-        if not safe_name.lower().endswith(".zip"):
-            safe_name = f"{safe_name}.zip"
+        safe_name = _safe_zip_name(base_name)
 
         upload_id = uuid.uuid4().hex
 
-        base_dir = Path(settings.FWAUDIT_UPLOAD_DIR)
-        chunk_root = base_dir / "chunk_uploads"
-        chunk_dir = chunk_root / upload_id
+        chunk_dir = FWAUDIT_CHUNK_ROOT / upload_id
         try:
             chunk_dir.mkdir(parents=True, exist_ok=False)
         except FileExistsError:
@@ -328,7 +527,7 @@ class AuditService:
                 detail="Failed to initialize upload directory",
             )
 
-        effective_script_name = script_name or Path(settings.FWAUDIT_SCRIPT_PATH).name
+        effective_script_name = script_name or DEFAULT_SCRIPT_NAME
         doc = {
             "uploadId": upload_id,
             "firmwareType": firmware_type,
@@ -358,7 +557,7 @@ class AuditService:
         total_chunks: int,
         chunk_file: UploadFile,
     ) -> None:
-        meta = self.db["audit_uploads"].find_one({"uploadId": upload_id})
+        meta = await run_in_threadpool(self.db["audit_uploads"].find_one, {"uploadId": upload_id})
         if not meta:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -378,9 +577,7 @@ class AuditService:
                 detail="Invalid chunk index",
             )
 
-        base_dir = Path(settings.FWAUDIT_UPLOAD_DIR)
-        chunk_root = base_dir / "chunk_uploads"
-        chunk_dir = chunk_root / upload_id
+        chunk_dir = FWAUDIT_CHUNK_ROOT / upload_id
         if not chunk_dir.is_dir():
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -390,19 +587,13 @@ class AuditService:
         part_path = chunk_dir / f"{chunk_index:06d}.part"
 
         try:
-            with part_path.open("wb") as f:
-                while True:
-                    data = await chunk_file.read(1024 * 1024)
-                    if not data:
-                        break
-                    f.write(data)
+            await run_in_threadpool(self._save_upload_file, chunk_file, part_path)
         except Exception as exc:  # noqa: BLE001
             logger.error("[upload %s] 写入分片失败(%s): %s", upload_id, chunk_index, exc)
-            if part_path.exists():
-                try:
-                    part_path.unlink()
-                except Exception:  # noqa: BLE001
-                    pass
+            try:
+                part_path.unlink(missing_ok=True)
+            except Exception:  # noqa: BLE001
+                pass
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to store chunk",
@@ -413,16 +604,14 @@ class AuditService:
         background_tasks: BackgroundTasks,
         upload_id: str,
     ) -> dict:
-        meta = self.db["audit_uploads"].find_one({"uploadId": upload_id})
+        meta = await run_in_threadpool(self.db["audit_uploads"].find_one, {"uploadId": upload_id})
         if not meta:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Upload session not found",
             )
 
-        base_dir = Path(settings.FWAUDIT_UPLOAD_DIR)
-        chunk_root = base_dir / "chunk_uploads"
-        chunk_dir = chunk_root / upload_id
+        chunk_dir = FWAUDIT_CHUNK_ROOT / upload_id
         if not chunk_dir.is_dir():
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -436,37 +625,31 @@ class AuditService:
                 detail="Invalid upload metadata",
             )
 
-        for index in range(total_chunks):
-            if not (chunk_dir / f"{index:06d}.part").is_file():
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Missing chunk",
-                )
+        # 一次 readdir 取得全部已上传分片，而不是逐个分片 stat
+        with os.scandir(chunk_dir) as entries:
+            present = {entry.name for entry in entries if entry.is_file()}
+        missing = [index for index in range(total_chunks) if f"{index:06d}.part" not in present]
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Missing chunk: {', '.join(map(str, missing[:5]))}",
+            )
 
         audit_id = uuid.uuid4().hex
-        upload_dir = base_dir / audit_id
+        upload_dir = FWAUDIT_UPLOAD_DIR / audit_id
         upload_dir.mkdir(parents=True, exist_ok=False)
 
         filename = str(meta.get("originalFilename") or f"{audit_id}.zip")
         target_path = upload_dir / filename
 
         try:
-            with target_path.open("wb") as dest:
-                for index in range(total_chunks):
-                    part_path = chunk_dir / f"{index:06d}.part"
-                    with part_path.open("rb") as src:
-                        while True:
-                            buf = src.read(1024 * 1024)
-                            if not buf:
-                                break
-                            dest.write(buf)
+            await run_in_threadpool(self._merge_chunks, target_path, chunk_dir, total_chunks)
         except Exception as exc:  # noqa: BLE001
             logger.error("[upload %s] 合并分片失败: %s", upload_id, exc)
-            if target_path.exists():
-                try:
-                    target_path.unlink()
-                except Exception:  # noqa: BLE001
-                    pass
+            try:
+                target_path.unlink(missing_ok=True)
+            except Exception:  # noqa: BLE001
+                pass
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to assemble uploaded file",
@@ -492,14 +675,15 @@ class AuditService:
             },
         }
         try:
-            self.db["audits"].update_one({"id": audit_id}, {"$set": audit_doc}, upsert=True)
+            await run_in_threadpool(
+                self.db["audits"].update_one, {"id": audit_id}, {"$set": audit_doc}, upsert=True
+            )
         except Exception as exc:  # noqa: BLE001
             logger.error("[audit %s] 初始化审计文档失败: %s", audit_id, exc)
-            if target_path.exists():
-                try:
-                    target_path.unlink()
-                except Exception:  # noqa: BLE001
-                    pass
+            try:
+                target_path.unlink(missing_ok=True)
+            except Exception:  # noqa: BLE001
+                pass
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to initialize audit task",
@@ -513,22 +697,12 @@ class AuditService:
         )
 
         try:
-            self.db["audit_uploads"].delete_one({"uploadId": upload_id})
+            await run_in_threadpool(self.db["audit_uploads"].delete_one, {"uploadId": upload_id})
         except Exception as exc:  # noqa: BLE001
             logger.error("[upload %s] 清理上传会话元数据失败: %s", upload_id, exc)
 
         try:
-            for index in range(total_chunks):
-                part_path = chunk_dir / f"{index:06d}.part"
-                if part_path.exists():
-                    try:
-                        part_path.unlink()
-                    except Exception:  # noqa: BLE001
-                        pass
-            try:
-                chunk_dir.rmdir()
-            except Exception:  # noqa: BLE001
-                pass
+            await run_in_threadpool(shutil.rmtree, chunk_dir)
         except Exception as exc:  # noqa: BLE001
             logger.error("[upload %s] 清理分片目录失败: %s", upload_id, exc)
 
@@ -540,15 +714,28 @@ class AuditService:
             "version": audit_doc["version"],
         }
 
-    def generate_audit_report_pdf(self, audit_id: str) -> str | None:
+    @staticmethod
+    def compute_report_etag(report: dict) -> str:
+        """
+        基于综合报告内容计算强 ETag。
+
+        PDF 完全由报告内容渲染而来，内容不变则 ETag 不变，
+        客户端携带 If-None-Match 重复下载时可直接返回 304，无需重新渲染 PDF。
+        """
+        raw = json.dumps(report, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")
+        return f'"{hashlib.sha256(raw).hexdigest()[:32]}"'
+
+    async def generate_audit_report_pdf(
+        self, audit_id: str, report: dict | None = None, etag: str | None = None
+    ) -> str | None:
         """
         为指定审计任务生成 PDF 审计报告。
 
         设计思路：
         1. 复用 get_audit_report 的结构化审计数据（时间、固件类型、汇总统计、检查项列表）
-        2. 按 audit_id 命名生成的 PDF 文件，统一存放在 FWAUDIT_REPORT_DIR 目录下
+        2. 按 audit_id 与报告内容摘要命名生成的 PDF 文件，统一存放在 FWAUDIT_REPORT_DIR 目录下
         3. 采用“按需生成 + 静态复用”策略：
-           - 如果磁盘上已存在对应 audit_id.pdf，则直接返回路径（避免重复生成）
+           - 如果磁盘上已存在对应 audit_id-<摘要>.pdf，则直接返回路径（避免重复生成）
            - 否则基于当前审计数据重新渲染一份新的 PDF
         4. 字体策略：
            - 优先尝试使用 FWAUDIT_PDF_FONT_PATH 指向的中文字体文件（TTF/OTF）
@@ -559,12 +746,47 @@ class AuditService:
         - 审计元信息卡片：任务 ID / 时间 / 固件类型 / 产品名称 / 版本号
         - 审计结果概览卡片：总数 / 合规 / 警告 / 错误
         - 详细检查项列表：状态 + 分类 + 名称 + 描述 + 规范条目
+
+        调用方已查询过综合报告并计算过 ETag 时可通过 report / etag 传入，避免重复查询与序列化。
+        ETag 计算需序列化整份报告，放到线程池执行；渲染在独立进程池中执行，均不占用事件循环。
         """
-        report = self.get_audit_report(audit_id)
+        if report is None:
+            report = await run_in_threadpool(self.get_audit_report, audit_id)
         if report is None:
             return None
 
-        return generate_audit_report_pdf_file(audit_id, report)
+        if etag is None:
+            etag = await run_in_threadpool(self.compute_report_etag, report)
+        version = etag.strip('"')
+        pdf_path = report_pdf_path(audit_id, version)
+        if pdf_path.is_file():
+            return str(pdf_path)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _get_pdf_pool(), generate_audit_report_pdf_file, audit_id, report, version
+        )
+
+    @staticmethod
+    def _encode_list_cursor(created_at: str | None, audit_id: str) -> str:
+        raw = json.dumps([created_at, audit_id], ensure_ascii=False).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii")
+
+    @staticmethod
+    def _decode_list_cursor(value: str) -> tuple[str | None, str]:
+        try:
+            created_at, audit_id = json.loads(base64.urlsafe_b64decode(value.encode("ascii")))
+        except Exception:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor",
+            )
+        if not isinstance(audit_id, str) or not isinstance(created_at, (str, type(None))):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor",
+            )
+        return created_at, audit_id
 
     def list_audits(
         self,
@@ -573,13 +795,16 @@ class AuditService:
         limit: int,
         offset: int,
         user_id: str | None = None,
+        before: str | None = None,
     ) -> dict:
         """
         查询审计任务列表（用于审计历史）。
 
         - 支持按状态和固件类型筛选
-        - 按 createdAt 倒序排序
-        - 使用 limit/offset 实现简单分页
+        - 按 (createdAt, id) 倒序排序；createdAt 只精确到秒且可能重复，用唯一的 id 保证顺序稳定
+        - 使用 limit/offset 实现简单分页；传入 before（上一页返回的不透明 nextCursor，
+          编码了最后一条记录的 createdAt 与 id）时改为游标分页，直接沿索引定位，
+          深翻页不再需要跳过前面 offset 条记录
         """
         query: dict[str, Any] = {}
 
@@ -592,15 +817,39 @@ class AuditService:
         if user_id:
             query["userId"] = user_id
 
-        total = self.db["audits"].count_documents(query)
+        if query:
+            total = self.db["audits"].count_documents(query)
+        else:
+            # 无过滤条件时直接读取集合元数据中的文档数，避免全量扫描计数
+            total = self.db["audits"].estimated_document_count()
+
+        if before:
+            # total 仍按筛选条件统计全部记录，游标条件只作用于本页查询
+            cursor_created_at, cursor_id = self._decode_list_cursor(before)
+            if cursor_created_at is None:
+                # 倒序时缺少 createdAt 的记录排在最后，只需在其中按 id 继续
+                query["createdAt"] = None
+                query["id"] = {"$lt": cursor_id}
+            else:
+                query["$or"] = [
+                    {"createdAt": {"$lt": cursor_created_at}},
+                    {"createdAt": cursor_created_at, "id": {"$lt": cursor_id}},
+                    {"createdAt": None},
+                ]
+            offset = 0
 
         cursor = (
             self.db["audits"]
-            .find(query, {"_id": 0})
-            .sort("createdAt", -1)
+            .find(query, AUDIT_LIST_PROJECTION)
+            .sort([("createdAt", -1), ("id", -1)])
             .skip(offset)
             .limit(limit)
         )
         items = list(cursor)
 
-        return {"items": items, "total": total}
+        next_cursor = None
+        if len(items) == limit and items[-1].get("id") is not None:
+            last = items[-1]
+            next_cursor = self._encode_list_cursor(last.get("createdAt"), last["id"])
+
+        return {"items": items, "total": total, "nextCursor": next_cursor}
@@ -1,13 +1,37 @@
 import base64
 import hashlib
 import hmac
-import json
 from datetime import datetime, timezone, timedelta
 from typing import Any
 
+try:  # orjson 为可选依赖，未安装时退回标准库 json
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
 from fastapi import HTTPException, status
 
-from app.core.config import settings
+from app.core.cache import TTLCache
+from app.core.config import OA_JWT_SECRET, USER_CACHE_TTL_SECONDS, settings
+
+
+# 按密钥缓存已完成密钥调度的 HMAC-SHA256 模板，每次校验只需 copy() 后追加签名输入
+_HMAC_TEMPLATES: dict[str, "hmac.HMAC"] = {}
+
+
+def _hmac_sha256_template(secret: str) -> "hmac.HMAC":
+    template = _HMAC_TEMPLATES.get(secret)
+    if template is None:
+        template = hmac.new(secret.encode("utf-8"), digestmod=hashlib.sha256)
+        _HMAC_TEMPLATES[secret] = template
+    return template
+
+
+# 已通过校验的 JWT 缓存：(密钥, token) -> payload，在 exp 之前重复提交同一 token 时跳过验签与解码
+_VERIFIED_TOKEN_CACHE = TTLCache(maxsize=10000)
+
+# 用户资料缓存：itcode -> profile，OA 登录回调更新资料后立即失效
+_USER_PROFILE_CACHE = TTLCache(maxsize=5000)
 
 
 class AuthService:
@@ -15,21 +39,29 @@ class AuthService:
         self.db = db
 
     @staticmethod
-    def _base64url_decode(value: str) -> bytes:
-        padding = "=" * (-len(value) % 4)
-        return base64.urlsafe_b64decode(value + padding)
+    def _base64url_decode(value: bytes) -> bytes:
+        return base64.urlsafe_b64decode(value + b"===="[: -len(value) & 3])
 
     def _decode_and_verify_jwt(self, token: str, secret: str) -> dict:
+        cache_key = (secret, token)
+        cached = _VERIFIED_TOKEN_CACHE.get(cache_key)
+        if cached is not None:
+            return dict(cached)
+
         try:
-            header_b64, payload_b64, signature_b64 = token.split(".")
-        except ValueError:
+            token_bytes = token.encode("ascii")
+            header_b64, payload_b64, signature_b64 = token_bytes.split(b".")
+        except (UnicodeEncodeError, ValueError):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid token format",
             )
 
-        signing_input = f"{header_b64}.{payload_b64}".encode("ascii")
-        expected_sig = hmac.new(secret.encode("utf-8"), signing_input, hashlib.sha256).digest()
+        # 签名输入即 token 中最后一个 "." 之前的部分，直接切片而不重新拼接
+        signing_input = token_bytes[: len(header_b64) + 1 + len(payload_b64)]
+        mac = _hmac_sha256_template(secret).copy()
+        mac.update(signing_input)
+        expected_sig = mac.digest()
 
         try:
             sig_bytes = self._base64url_decode(signature_b64)
@@ -47,7 +79,7 @@ class AuthService:
 
         try:
             payload_bytes = self._base64url_decode(payload_b64)
-            payload = json.loads(payload_bytes)
+            payload = _json_loads(payload_bytes)
         except Exception:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -68,6 +100,7 @@ class AuthService:
                 detail="Token has expired",
             )
 
+        _VERIFIED_TOKEN_CACHE.set(cache_key, dict(payload), float(exp) - now_ts)
         return payload
 
     def handle_oa_callback(self, status_value: str, payload_token: str, next_url: str | None) -> dict:
@@ -77,13 +110,13 @@ class AuthService:
                 detail="OA login failed",
             )
 
-        if not settings.OA_JWT_SECRET:
+        if not OA_JWT_SECRET:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="OA JWT secret not configured",
             )
 
-        decoded = self._decode_and_verify_jwt(payload_token, settings.OA_JWT_SECRET)
+        decoded = self._decode_and_verify_jwt(payload_token, OA_JWT_SECRET)
 
         itcode = decoded.get("itcode")
         if not itcode:
@@ -108,6 +141,7 @@ class AuthService:
             },
             upsert=True,
         )
+        _USER_PROFILE_CACHE.pop(itcode)
 
         session_id = self._create_session(itcode, now)
 
@@ -136,19 +170,30 @@ class AuthService:
         return session_id
 
     def require_login(self, token: str | None) -> dict:
+        return self.require_login_with_expiry(token)[0]
+
+    def require_login_with_expiry(self, token: str | None) -> tuple[dict, float | None]:
+        """
+        校验会话并返回 (当前用户信息, 会话过期的 Unix 时间戳)。
+
+        过期时间供调用方限定会话缓存的有效期；会话未记录 expiresAt 时返回 None。
+        """
         if not token:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Missing session token",
             )
 
-        session = self.db["sessions"].find_one({"sessionId": token})
+        session = self.db["sessions"].find_one(
+            {"sessionId": token}, {"_id": 0, "itcode": 1, "expiresAt": 1}
+        )
         if not session:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid session token",
             )
 
+        expires_ts: float | None = None
         expires_at = session.get("expiresAt")
         if expires_at is not None:
             try:
@@ -157,15 +202,36 @@ class AuthService:
                     exp_dt = exp_dt.replace(tzinfo=timezone.utc)
             except Exception:
                 exp_dt = None
-            if exp_dt is not None and datetime.now(timezone.utc) > exp_dt:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Session expired",
-                )
-
-        user = self.db["users"].find_one({"itcode": session.get("itcode")}) or {}
+            if exp_dt is not None:
+                if datetime.now(timezone.utc) > exp_dt:
+                    raise HTTPException(
+                        status_code=status.HTTP_401_UNAUTHORIZED,
+                        detail="Session expired",
+                    )
+                expires_ts = exp_dt.timestamp()
+
+        return self.build_current_user(token, session.get("itcode")), expires_ts
+
+    def build_current_user(self, token: str, itcode: str | None) -> dict:
+        """
+        组装当前登录用户信息；用户资料经 _get_user_profile 读取，OA 登录回调更新资料后即可生效。
+        """
         return {
             "sessionId": token,
-            "itcode": session.get("itcode"),
-            "user": user.get("profile") or {},
+            "itcode": itcode,
+            "user": self._get_user_profile(itcode),
         }
+
+    def _get_user_profile(self, itcode: str | None) -> dict:
+        """
+        按 itcode 获取用户资料，结果在进程内缓存 USER_CACHE_TTL_SECONDS 秒。
+        """
+        cached = _USER_PROFILE_CACHE.get(itcode) if itcode is not None else None
+        if cached is not None:
+            return cached
+
+        user = self.db["users"].find_one({"itcode": itcode}, {"_id": 0, "profile": 1}) or {}
+        profile = user.get("profile") or {}
+        if itcode is not None:
+            _USER_PROFILE_CACHE.set(itcode, profile, USER_CACHE_TTL_SECONDS)
+        return profile
@@ -0,0 +1,42 @@
+import threading
+import time
+from typing import Any, Hashable
+
+
+class TTLCache:
+    """
+    进程内的定长 TTL 缓存，可在线程池中的多个请求线程间安全共享。
+
+    - 每个条目写入时指定存活秒数，过期后读取视为未命中并顺带删除
+    - 条目数达到 maxsize 时淘汰最早写入的条目（dict 保持插入顺序）
+    - 所有读写都在同一把锁内完成，淘汰时遍历 dict 不会与其他线程的写入交错
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._data: dict[Hashable, tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any | None:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= now:
+                del self._data[key]
+                return None
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        if ttl <= 0:
+            return
+        expires_at = time.monotonic() + ttl
+        with self._lock:
+            if key not in self._data and self._data and len(self._data) >= self.maxsize:
+                del self._data[next(iter(self._data))]
+            self._data[key] = (expires_at, value)
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
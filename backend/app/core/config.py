@@ -2,15 +2,24 @@ import os
 import sys
 from pathlib import Path
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class Settings(BaseModel):
+    # 配置在进程启动后不再修改
+    model_config = ConfigDict(frozen=True)
+
     APP_NAME: str = "Firmware Check Service"
     VERSION: str = "0.1.0"
 
     MONGO_URI: str = os.getenv("MONGO_URI", "mongodb://10.17.154.252:27018")
     MONGO_DB_NAME: str = os.getenv("MONGO_DB_NAME", "firmware_audit")
+    # MongoClient 连接池上限：同步端点在线程池中并发执行，每个并发请求占用一个连接
+    MONGO_MAX_POOL_SIZE: int = int(os.getenv("MONGO_MAX_POOL_SIZE", "50"))
+    # 连接池常驻的最少连接数，避免空闲后首个请求重新建立 TCP/认证握手
+    MONGO_MIN_POOL_SIZE: int = int(os.getenv("MONGO_MIN_POOL_SIZE", "5"))
+    # 空闲连接的最长保留时间（毫秒），超过后回收；0 表示不限制
+    MONGO_MAX_IDLE_TIME_MS: int = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "1800000"))
 
     FWAUDIT_SCRIPT_TIMEOUT: int = int(os.getenv("FWAUDIT_SCRIPT_TIMEOUT", "3600"))
     FWAUDIT_SCRIPT_PATH: str = os.getenv(
@@ -33,6 +42,10 @@ class Settings(BaseModel):
     # - 若未配置或路径无效，则会退回使用内置的 CJK 字体 STSong-Light
     # - 若两者都不可用则最终退回 Helvetica（此时中文会乱码）
     FWAUDIT_PDF_FONT_PATH: str | None = os.getenv("FWAUDIT_PDF_FONT_PATH") or None
+    # 清理被新版本取代的 PDF 缓存的周期（秒），只删除早于一个周期之前写入的旧版本；设为 0 关闭
+    FWAUDIT_REPORT_CLEANUP_INTERVAL_SECONDS: int = int(os.getenv("FWAUDIT_REPORT_CLEANUP_INTERVAL_SECONDS", "3600"))
+    # PDF 报告渲染进程池的进程数
+    FWAUDIT_PDF_WORKERS: int = int(os.getenv("FWAUDIT_PDF_WORKERS", str(min(4, os.cpu_count() or 1))))
     PYTHON_EXECUTABLE: str = os.getenv("PYTHON_EXECUTABLE", sys.executable)
     OA_JWT_SECRET: str = os.getenv("OA_JWT_SECRET", "YWNnw5hwP1e3tSFx6CFYeRvWRSSJhRiC")
     OA_APP_NAME: str = os.getenv("OA_APP_NAME", "bytespkgcheck")
@@ -40,9 +53,24 @@ class Settings(BaseModel):
         "OA_LOGIN_BASE_URL",
         "http://tl.cooacloud.com/springboard_v3/login_proxy",
     )
+    # 允许跨域访问的前端来源，逗号分隔；默认 "*" 允许任意来源
+    CORS_ORIGINS: list[str] = [
+        origin.strip() for origin in os.getenv("CORS_ORIGINS", "*").split(",") if origin.strip()
+    ]
     SESSION_EXPIRE_HOURS: int = int(os.getenv("SESSION_EXPIRE_HOURS", "8"))
+    # 已校验会话在进程内的缓存时长（秒），设为 0 可关闭缓存
+    SESSION_CACHE_TTL_SECONDS: int = int(os.getenv("SESSION_CACHE_TTL_SECONDS", "60"))
+    # 用户资料（users 集合）在进程内的缓存时长（秒），设为 0 可关闭缓存
+    USER_CACHE_TTL_SECONDS: int = int(os.getenv("USER_CACHE_TTL_SECONDS", "30"))
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "15"))
     REFRESH_TOKEN_EXPIRE_DAYS: int = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "30"))
 
 
 settings = Settings()
+
+# 请求处理热路径上使用的配置项导出为模块级常量，避免每次经由模型实例属性访问
+PYTHON_EXECUTABLE = settings.PYTHON_EXECUTABLE
+FWAUDIT_SCRIPT_TIMEOUT = settings.FWAUDIT_SCRIPT_TIMEOUT
+OA_JWT_SECRET = settings.OA_JWT_SECRET
+SESSION_CACHE_TTL_SECONDS = settings.SESSION_CACHE_TTL_SECONDS
+USER_CACHE_TTL_SECONDS = settings.USER_CACHE_TTL_SECONDS
@@ -1,8 +1,56 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api import api_router
+from app.api.v1.endpoints import close_mongo_client, ensure_mongo_indexes, get_mongo_db
+from app.audit_service import shutdown_pdf_pool
 from app.core.config import settings
+from app.pdf_report import cleanup_stale_report_pdfs
+
+
+logger = logging.getLogger(__name__)
+
+
+async def _report_cleanup_loop(interval: int) -> None:
+    """定期清理被新版本取代的 PDF 缓存，代替在请求路径中删除旧文件。"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await run_in_threadpool(cleanup_stale_report_pdfs, interval)
+        except Exception:  # noqa: BLE001
+            logger.exception("清理过期 PDF 报告失败")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    应用生命周期：
+    - 启动时创建 MongoDB 客户端（连接池按 minPoolSize 在后台建连），并在后台线程中创建索引
+    - 运行期间定期清理被新版本取代的 PDF 缓存
+    - 关闭时释放 MongoClient 连接池与 PDF 渲染进程池
+    """
+    # 创建客户端本身不等待连接；create_index 需要选择服务器，数据库不可达时会阻塞到
+    # serverSelectionTimeoutMS，因此放到线程池后台执行，失败只记录日志，启动不受影响
+    get_mongo_db()
+    index_task = asyncio.create_task(run_in_threadpool(ensure_mongo_indexes))
+    cleanup_task = None
+    if settings.FWAUDIT_REPORT_CLEANUP_INTERVAL_SECONDS > 0:
+        cleanup_task = asyncio.create_task(
+            _report_cleanup_loop(settings.FWAUDIT_REPORT_CLEANUP_INTERVAL_SECONDS)
+        )
+    yield
+    for task in (index_task, cleanup_task):
+        if task is not None and not task.done():
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+    shutdown_pdf_pool()
+    close_mongo_client()
 
 
 def create_app() -> FastAPI:
@@ -10,14 +58,17 @@ def create_app() -> FastAPI:
         title=settings.APP_NAME,
         version=settings.VERSION,
         description="Firmware check service backend.",
+        lifespan=lifespan,
     )
 
+    # 只放行前端实际使用的方法与请求头，预检请求可直接按固定列表应答
     app.add_middleware(
         CORSMiddleware,
-        allow_origins=["*"],
+        allow_origins=settings.CORS_ORIGINS,
         allow_credentials=True,
-        allow_methods=["*"],
-        allow_headers=["*"],
+        allow_methods=["GET", "POST"],
+        allow_headers=["Content-Type", "X-Session-Token", "If-None-Match"],
+        max_age=3600,
     )
 
     app.include_router(api_router, prefix="/api")
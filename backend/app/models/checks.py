@@ -1,7 +1,7 @@
 from enum import Enum
-from typing import List, Optional, Dict, Any
+from typing import List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class CheckStatus(str, Enum):
@@ -11,6 +11,8 @@ class CheckStatus(str, Enum):
 
 
 class CheckItem(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     id: str = Field(..., description="检查项唯一标识")
     category: str = Field(..., description="检查类别")
     name: str = Field(..., description="检查项名称")
@@ -28,7 +30,7 @@ class CheckItem(BaseModel):
         None,
         description="对应旧脚本中的步骤编号",
     )
-    details: Optional[Dict[str, Any]] = Field(
+    details: Optional[dict] = Field(
         default=None,
         description="额外细节信息",
     )
@@ -62,10 +64,12 @@ class CheckRunSummary(BaseModel):
 
 
 class CheckReport(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     firmware: FirmwareInfo = Field(..., description="固件基础信息")
     summary: CheckRunSummary = Field(..., description="检查汇总信息")
     items: List[CheckItem] = Field(..., description="具体检查项列表")
-    extra: Optional[Dict[str, Any]] = Field(
+    extra: Optional[dict] = Field(
         default=None,
         description="附加信息",
     )
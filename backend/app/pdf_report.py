@@ -1,6 +1,10 @@
 from pathlib import Path
 from typing import Any, List, Tuple
-import datetime
+import os
+import re
+import time
+from functools import lru_cache
+import uuid
 
 from reportlab.lib import colors
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
@@ -23,21 +27,77 @@ from reportlab.platypus import (
 from app.core.config import settings
 
 
+# --- 与报告内容无关的颜色、样式与表格样式，在模块导入时构建一次 ---
+_COLOR_DARK_BLUE = colors.HexColor('#1A365D')
+_COLOR_TEXT_PRIMARY = colors.HexColor('#2D3748')
+_COLOR_TEXT_SECONDARY = colors.HexColor('#718096')
+_COLOR_BORDER = colors.HexColor('#E2E8F0')
+_COLOR_BG_HEADER = colors.HexColor('#F7FAFC')
+
+# 检查状态 -> (状态单元格背景色, 状态文字颜色, 中文标签)
+_STATUS_PROPS = {
+    "PASS": (colors.HexColor('#F0FFF4'), colors.HexColor('#22543D'), "通过"),
+    "WARNING": (colors.HexColor('#FFFAF0'), colors.HexColor('#9C4221'), "警告"),
+    "FAIL": (colors.HexColor('#FFF5F5'), colors.HexColor('#9B2C2C'), "错误"),
+}
+
+_META_TABLESTYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (0, -1), _COLOR_BG_HEADER),
+    ('GRID', (0, 0), (-1, -1), 0.5, _COLOR_BORDER),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('PADDING', (0, 0), (-1, -1), 6),
+])
+
+_SUMMARY_TABLESTYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (0, 0), colors.HexColor('#4299E1')), # Blue
+    ('BACKGROUND', (1, 0), (1, 0), colors.HexColor('#48BB78')), # Green
+    ('BACKGROUND', (2, 0), (2, 0), colors.HexColor('#ED8936')), # Orange
+    ('BACKGROUND', (3, 0), (3, 0), colors.HexColor('#F56565')), # Red
+    ('BACKGROUND', (0, 1), (-1, 1), colors.white),
+    ('BOX', (0, 0), (-1, -1), 0.5, _COLOR_BORDER),
+    ('INNERGRID', (0, 0), (-1, -1), 0.5, _COLOR_BORDER),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('PADDING', (0, 0), (-1, -1), 8),
+])
+
+# 警告/错误概览表与详细检查表的公共样式，逐行的 BACKGROUND/LINEBELOW 在生成时追加
+_ISSUE_TABLE_BASE_STYLE: List[Tuple[Any, ...]] = [
+    ('BACKGROUND', (0, 0), (-1, 0), _COLOR_DARK_BLUE),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+    ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ('PADDING', (0, 0), (-1, -1), 6),
+]
+
+_CHECK_TABLE_BASE_STYLE: List[Tuple[Any, ...]] = [
+    ('BACKGROUND', (0, 0), (-1, 0), _COLOR_DARK_BLUE),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ('PADDING', (0, 0), (-1, -1), 6),
+]
+
+
+@lru_cache(maxsize=1)
 def register_fonts() -> Tuple[str, str]:
     """
     Registers fonts and returns (body_font_name, title_font_name).
     Prioritizes custom font, then STSong-Light, then Helvetica.
+    Font registration is process-global, so the result is cached per process.
     """
     font_name = "CNBody"
     title_font_name = "CNTitle"
     font_path = settings.FWAUDIT_PDF_FONT_PATH
     registered = False
+    registered_names = pdfmetrics.getRegisteredFontNames()
 
     if font_path and Path(font_path).is_file():
         try:
-            pdfmetrics.registerFont(TTFont(font_name, font_path))
+            if font_name not in registered_names:
+                pdfmetrics.registerFont(TTFont(font_name, font_path))
             # We use the same font for title if only one is provided
-            pdfmetrics.registerFont(TTFont(title_font_name, font_path))
+            if title_font_name not in registered_names:
+                pdfmetrics.registerFont(TTFont(title_font_name, font_path))
             registered = True
         except Exception:
             registered = False
@@ -45,7 +105,8 @@ def register_fonts() -> Tuple[str, str]:
     if not registered:
         try:
             base_cjk_font = "STSong-Light"
-            pdfmetrics.registerFont(UnicodeCIDFont(base_cjk_font))
+            if base_cjk_font not in registered_names:
+                pdfmetrics.registerFont(UnicodeCIDFont(base_cjk_font))
             font_name = base_cjk_font
             title_font_name = base_cjk_font
             registered = True
@@ -59,96 +120,181 @@ def register_fonts() -> Tuple[str, str]:
     return font_name, title_font_name
 
 
-def generate_audit_report_pdf_file(audit_id: str, report: dict[str, Any]) -> str:
-    report_dir = Path(settings.FWAUDIT_REPORT_DIR)
-    report_dir.mkdir(parents=True, exist_ok=True)
-    pdf_path = report_dir / f"{audit_id}.pdf"
-
-    if pdf_path.is_file():
-        return str(pdf_path)
-
-    body_font, title_font = register_fonts()
-
-    # --- Styles ---
+@lru_cache(maxsize=None)
+def _build_styles(body_font: str, title_font: str) -> dict[str, Any]:
+    """
+    构建报告使用的全部段落样式（按字体组合缓存，每个进程只构建一次）。
+    """
     styles = getSampleStyleSheet()
 
-    # Define custom colors
-    color_dark_blue = colors.HexColor('#1A365D')
-    color_text_primary = colors.HexColor('#2D3748')
-    color_text_secondary = colors.HexColor('#718096')
-    color_border = colors.HexColor('#E2E8F0')
-    color_bg_header = colors.HexColor('#F7FAFC')
-
-    style_title = ParagraphStyle(
-        name='AuditTitle',
-        parent=styles['Title'],
-        fontName=title_font,
-        fontSize=22,
-        leading=28,
-        alignment=TA_CENTER,
-        textColor=color_dark_blue,
-        spaceAfter=5 * mm
-    )
-
-    style_subtitle = ParagraphStyle(
-        name='AuditSubtitle',
-        parent=styles['Normal'],
-        fontName="Helvetica",
-        fontSize=12,
-        alignment=TA_CENTER,
-        textColor=color_text_secondary,
-        spaceAfter=15 * mm
-    )
-
-    style_h2 = ParagraphStyle(
-        name='AuditH2',
-        parent=styles['Heading2'],
-        fontName=title_font,
-        fontSize=14,
-        leading=18,
-        textColor=color_dark_blue,
-        spaceBefore=12,
-        spaceAfter=8,
-    )
-
     style_normal = ParagraphStyle(
         name='AuditNormal',
         parent=styles['Normal'],
         fontName=body_font,
         fontSize=10,
         leading=14,
-        textColor=color_text_primary,
+        textColor=_COLOR_TEXT_PRIMARY,
     )
 
-    style_table_header = ParagraphStyle(
-        name='TableHeader',
-        parent=style_normal,
-        fontName=title_font,
-        fontSize=10,
-        textColor=colors.white,
-        alignment=TA_CENTER
-    )
+    return {
+        "title": ParagraphStyle(
+            name='AuditTitle',
+            parent=styles['Title'],
+            fontName=title_font,
+            fontSize=22,
+            leading=28,
+            alignment=TA_CENTER,
+            textColor=_COLOR_DARK_BLUE,
+            spaceAfter=5 * mm
+        ),
+        "subtitle": ParagraphStyle(
+            name='AuditSubtitle',
+            parent=styles['Normal'],
+            fontName="Helvetica",
+            fontSize=12,
+            alignment=TA_CENTER,
+            textColor=_COLOR_TEXT_SECONDARY,
+            spaceAfter=15 * mm
+        ),
+        "h2": ParagraphStyle(
+            name='AuditH2',
+            parent=styles['Heading2'],
+            fontName=title_font,
+            fontSize=14,
+            leading=18,
+            textColor=_COLOR_DARK_BLUE,
+            spaceBefore=12,
+            spaceAfter=8,
+        ),
+        "normal": style_normal,
+        "table_header": ParagraphStyle(
+            name='TableHeader',
+            parent=style_normal,
+            fontName=title_font,
+            fontSize=10,
+            textColor=colors.white,
+            alignment=TA_CENTER
+        ),
+        "check_name": ParagraphStyle(
+            name='CheckName',
+            parent=style_normal,
+            fontName=title_font,
+            fontSize=10.5,
+            textColor=_COLOR_TEXT_PRIMARY,
+            spaceAfter=2
+        ),
+        "check_desc": ParagraphStyle(
+            name='CheckDesc',
+            parent=style_normal,
+            fontSize=9,
+            textColor=_COLOR_TEXT_SECONDARY,
+            leading=12
+        ),
+        # 序号/类别单元格
+        "cell_secondary": ParagraphStyle(
+            'CellSecondary', parent=style_normal, alignment=TA_CENTER, textColor=_COLOR_TEXT_SECONDARY, fontSize=9
+        ),
+        "meta_key": ParagraphStyle(
+            'MetaKey', parent=style_normal, fontName=title_font, alignment=TA_RIGHT, textColor=_COLOR_TEXT_SECONDARY
+        ),
+        # 概览表数值行为纯文本单元格，字体/字号/颜色通过表格样式设置，避免为四个数字构建 Paragraph
+        "summary_table": TableStyle([
+            ('FONTNAME', (0, 1), (-1, 1), title_font),
+            ('FONTSIZE', (0, 1), (-1, 1), 16),
+            ('LEADING', (0, 1), (-1, 1), 14),
+            ('ALIGN', (0, 1), (-1, 1), 'CENTER'),
+            ('TEXTCOLOR', (0, 1), (0, 1), colors.HexColor('#2B6CB0')),
+            ('TEXTCOLOR', (1, 1), (1, 1), colors.HexColor('#2F855A')),
+            ('TEXTCOLOR', (2, 1), (2, 1), colors.HexColor('#C05621')),
+            ('TEXTCOLOR', (3, 1), (3, 1), colors.HexColor('#C53030')),
+        ], parent=_SUMMARY_TABLESTYLE),
+        # 状态单元格：按状态区分文字颜色，未知状态使用正文颜色
+        "status": {
+            key: ParagraphStyle(
+                'StatusCell', parent=style_normal, alignment=TA_CENTER, textColor=text_color, fontName=title_font
+            )
+            for key, (_, text_color, _) in _STATUS_PROPS.items()
+        },
+        "status_default": ParagraphStyle(
+            'StatusCell', parent=style_normal, alignment=TA_CENTER, textColor=_COLOR_TEXT_PRIMARY, fontName=title_font
+        ),
+    }
+
+
+def report_pdf_path(audit_id: str, version: str | None = None) -> Path:
+    """
+    返回审计报告 PDF 的缓存路径。
 
-    style_check_name = ParagraphStyle(
-        name='CheckName',
-        parent=style_normal,
-        fontName=title_font,
-        fontSize=10.5,
-        textColor=color_text_primary,
-        spaceAfter=2
-    )
+    version 为报告内容的摘要（如 ETag），写入文件名后报告内容变化（例如审计完成后
+    summary/checks 更新）会自然落到新文件，不会继续返回旧内容。
+    """
+    name = f"{audit_id}-{version}.pdf" if version else f"{audit_id}.pdf"
+    return Path(settings.FWAUDIT_REPORT_DIR) / name
+
+
+# 缓存文件名：{audit_id}.pdf 或 {audit_id}-{32 位十六进制内容摘要}.pdf
+_REPORT_PDF_NAME_RE = re.compile(r"^(?P<audit_id>.+?)(?:-[0-9a-f]{32})?\.pdf$")
 
-    style_check_desc = ParagraphStyle(
-        name='CheckDesc',
-        parent=style_normal,
-        fontSize=9,
-        textColor=color_text_secondary,
-        leading=12
-    )
+
+def cleanup_stale_report_pdfs(min_age_seconds: float) -> int:
+    """
+    删除已被同一审计任务更新版本取代的 PDF 缓存，返回删除的文件数。
+
+    每个审计任务保留最新写入的一份；其余版本只有在最后修改时间早于 min_age_seconds 之前
+    时才删除，避免删掉并发请求刚生成、正要通过 FileResponse 返回的文件。
+    由后台定时任务调用，不在请求路径中执行。
+    """
+    report_dir = Path(settings.FWAUDIT_REPORT_DIR)
+    if not report_dir.is_dir():
+        return 0
+
+    groups: dict[str, list[tuple[float, Path]]] = {}
+    for path in report_dir.glob("*.pdf"):
+        match = _REPORT_PDF_NAME_RE.match(path.name)
+        if match is None:
+            continue
+        try:
+            mtime = path.stat().st_mtime
+        except FileNotFoundError:
+            continue
+        groups.setdefault(match.group("audit_id"), []).append((mtime, path))
+
+    cutoff = time.time() - min_age_seconds
+    removed = 0
+    for versions in groups.values():
+        versions.sort(reverse=True)
+        for mtime, path in versions[1:]:
+            if mtime < cutoff:
+                path.unlink(missing_ok=True)
+                removed += 1
+    return removed
+
+
+def generate_audit_report_pdf_file(audit_id: str, report: dict[str, Any], version: str | None = None) -> str:
+    pdf_path = report_pdf_path(audit_id, version)
+    report_dir = pdf_path.parent
+    report_dir.mkdir(parents=True, exist_ok=True)
+
+    if pdf_path.is_file():
+        return str(pdf_path)
+
+    # 先写入临时文件再原子替换，并发请求或中途失败都不会留下半成品 PDF
+    tmp_path = report_dir / f".{pdf_path.name}.{uuid.uuid4().hex}.tmp"
+
+    body_font, title_font = register_fonts()
+    st = _build_styles(body_font, title_font)
+    style_title = st["title"]
+    style_subtitle = st["subtitle"]
+    style_h2 = st["h2"]
+    style_normal = st["normal"]
+    style_table_header = st["table_header"]
+    style_check_name = st["check_name"]
+    style_check_desc = st["check_desc"]
+    style_cell_secondary = st["cell_secondary"]
 
     # --- Document Setup ---
     doc = SimpleDocTemplate(
-        str(pdf_path),
+        str(tmp_path),
         pagesize=A4,
         rightMargin=15 * mm,
         leftMargin=15 * mm,
@@ -159,13 +305,13 @@ def generate_audit_report_pdf_file(audit_id: str, report: dict[str, Any]) -> str
     def header_footer(canvas, doc):
         canvas.saveState()
         canvas.setFont("Helvetica", 9)
-        canvas.setFillColor(color_text_secondary)
+        canvas.setFillColor(_COLOR_TEXT_SECONDARY)
         page_num_text = f"Page {doc.page}"
         canvas.drawRightString(A4[0] - 15 * mm, 10 * mm, page_num_text)
         canvas.drawString(15 * mm, 10 * mm, "ByteDance Firmware Compliance Audit")
         
         # Draw a decorative line at top
-        canvas.setStrokeColor(color_dark_blue)
+        canvas.setStrokeColor(_COLOR_DARK_BLUE)
         canvas.setLineWidth(1)
         canvas.line(15 * mm, A4[1] - 15 * mm, A4[0] - 15 * mm, A4[1] - 15 * mm)
         
@@ -180,21 +326,6 @@ def generate_audit_report_pdf_file(audit_id: str, report: dict[str, Any]) -> str
     # 2. Metadata Table
     report_id = str(report.get("id", ""))
 
-    def format_timestamp(value: str) -> str:
-        if not value:
-            return ""
-        raw = value
-        if raw.endswith("Z"):
-            raw = raw[:-1] + "+00:00"
-        try:
-            dt = datetime.datetime.fromisoformat(raw)
-        except Exception:
-            return value
-        if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=datetime.timezone.utc)
-        dt_local = dt.astimezone(datetime.timezone(datetime.timedelta(hours=8)))
-        return dt_local.strftime("%Y-%m-%d %H:%M:%S")
-
     timestamp = str(report.get("timestamp", ""))
     firmware_type = str(report.get("firmwareType", ""))
     product_name = str(report.get("productName", ""))
@@ -211,17 +342,12 @@ def generate_audit_report_pdf_file(audit_id: str, report: dict[str, Any]) -> str
     meta_table_rows = []
     for k, v in meta_data:
         meta_table_rows.append([
-            Paragraph(k, ParagraphStyle('MetaKey', parent=style_normal, fontName=title_font, alignment=TA_RIGHT, textColor=color_text_secondary)),
+            Paragraph(k, st["meta_key"]),
             Paragraph(v, style_normal)
         ])
 
     t_meta = Table(meta_table_rows, colWidths=[60 * mm, 110 * mm], hAlign='CENTER')
-    t_meta.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (0, -1), color_bg_header),
-        ('GRID', (0, 0), (-1, -1), 0.5, color_border),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('PADDING', (0, 0), (-1, -1), 6),
-    ]))
+    t_meta.setStyle(_META_TABLESTYLE)
 
     story.append(Paragraph("审计元信息 / Audit Information", style_h2))
     story.append(t_meta)
@@ -234,13 +360,6 @@ def generate_audit_report_pdf_file(audit_id: str, report: dict[str, Any]) -> str
     warning = str(summary.get("warning", 0))
     failed = str(summary.get("failed", 0))
 
-    # Styles for stats
-    style_num_base = ParagraphStyle('NumBase', parent=style_normal, fontSize=16, alignment=TA_CENTER, fontName=title_font, spaceBefore=4)
-    style_num_total = ParagraphStyle('NumTotal', parent=style_num_base, textColor=colors.HexColor('#2B6CB0'))
-    style_num_pass = ParagraphStyle('NumPass', parent=style_num_base, textColor=colors.HexColor('#2F855A'))
-    style_num_warn = ParagraphStyle('NumWarn', parent=style_num_base, textColor=colors.HexColor('#C05621'))
-    style_num_fail = ParagraphStyle('NumFail', parent=style_num_base, textColor=colors.HexColor('#C53030'))
-
     summary_table_data = [
         [
             Paragraph("总检查项", style_table_header),
@@ -248,26 +367,11 @@ def generate_audit_report_pdf_file(audit_id: str, report: dict[str, Any]) -> str
             Paragraph("警告", style_table_header),
             Paragraph("错误", style_table_header)
         ],
-        [
-            Paragraph(total, style_num_total),
-            Paragraph(passed, style_num_pass),
-            Paragraph(warning, style_num_warn),
-            Paragraph(failed, style_num_fail)
-        ]
+        [total, passed, warning, failed]
     ]
 
     t_summary = Table(summary_table_data, colWidths=[42 * mm] * 4, hAlign='CENTER')
-    t_summary.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (0, 0), colors.HexColor('#4299E1')), # Blue
-        ('BACKGROUND', (1, 0), (1, 0), colors.HexColor('#48BB78')), # Green
-        ('BACKGROUND', (2, 0), (2, 0), colors.HexColor('#ED8936')), # Orange
-        ('BACKGROUND', (3, 0), (3, 0), colors.HexColor('#F56565')), # Red
-        ('BACKGROUND', (0, 1), (-1, 1), colors.white),
-        ('BOX', (0, 0), (-1, -1), 0.5, color_border),
-        ('INNERGRID', (0, 0), (-1, -1), 0.5, color_border),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('PADDING', (0, 0), (-1, -1), 8),
-    ]))
+    t_summary.setStyle(st["summary_table"])
 
     story.append(Paragraph("审计概览 / Audit Summary", style_h2))
     story.append(t_summary)
@@ -276,20 +380,25 @@ def generate_audit_report_pdf_file(audit_id: str, report: dict[str, Any]) -> str
     # 4. Detailed Checks Section
     checks = report.get("checks") or []
 
-    indexed_checks: List[tuple[int, dict[str, Any]]] = [
-        (idx + 1, c) for idx, c in enumerate(checks)
-    ]
-
-    warning_checks: List[tuple[int, dict[str, Any]]] = [
-        (index, c)
-        for index, c in indexed_checks
-        if str(c.get("status", "")).upper() == "WARNING"
-    ]
-    failed_checks: List[tuple[int, dict[str, Any]]] = [
-        (index, c)
-        for index, c in indexed_checks
-        if str(c.get("status", "")).upper() == "FAIL"
-    ]
+    # 单次遍历按状态划分警告/错误项；状态由检查脚本按 CheckStatus 写入，已是规范大写形式
+    warning_checks: List[tuple[int, dict[str, Any]]] = []
+    failed_checks: List[tuple[int, dict[str, Any]]] = []
+    for index, c in enumerate(checks, 1):
+        check_status = c.get("status")
+        if check_status == "WARNING":
+            warning_checks.append((index, c))
+        elif check_status == "FAIL":
+            failed_checks.append((index, c))
+
+    # 序号与类别单元格内容高度重复（类别通常只有少数几种），同一报告内按文本复用 Paragraph；
+    # Table 绘制单元格前会重新 wrap，共享同一实例不影响排版
+    secondary_para_cache: dict[str, Paragraph] = {}
+
+    def secondary_para(text: str) -> Paragraph:
+        para = secondary_para_cache.get(text)
+        if para is None:
+            para = secondary_para_cache[text] = Paragraph(text, style_cell_secondary)
+        return para
 
     def build_issue_table(issue_checks: List[tuple[int, dict[str, Any]]], title_text: str):
         if not issue_checks:
@@ -311,21 +420,8 @@ def generate_audit_report_pdf_file(audit_id: str, report: dict[str, Any]) -> str
             description = check.get("description", "")
             standard = check.get("standard", "")
 
-            category_para = Paragraph(category, ParagraphStyle(
-                'WarnErrCategoryCell',
-                parent=style_normal,
-                alignment=TA_CENTER,
-                textColor=color_text_secondary,
-                fontSize=9
-            ))
-
-            index_para = Paragraph(str(index_value), ParagraphStyle(
-                'WarnErrIndexCell',
-                parent=style_normal,
-                alignment=TA_CENTER,
-                textColor=color_text_secondary,
-                fontSize=9
-            ))
+            category_para = secondary_para(category)
+            index_para = secondary_para(str(index_value))
 
             details_flowables: List[Any] = [Paragraph(name, style_check_name)]
             if description:
@@ -340,7 +436,7 @@ def generate_audit_report_pdf_file(audit_id: str, report: dict[str, Any]) -> str
                 details_flowables,
             ])
 
-            row_styles_local.append(('LINEBELOW', (0, row_idx), (-1, row_idx), 0.5, color_border))
+            row_styles_local.append(('LINEBELOW', (0, row_idx), (-1, row_idx), 0.5, _COLOR_BORDER))
 
         t_issues = Table(
             table_data,
@@ -348,15 +444,7 @@ def generate_audit_report_pdf_file(audit_id: str, report: dict[str, Any]) -> str
             hAlign='CENTER'
         )
 
-        table_style_list_local: List[Tuple[Any, ...]] = [
-            ('BACKGROUND', (0, 0), (-1, 0), color_dark_blue),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-            ('PADDING', (0, 0), (-1, -1), 6),
-        ]
-        table_style_list_local.extend(row_styles_local)
-        t_issues.setStyle(TableStyle(table_style_list_local))
+        t_issues.setStyle(TableStyle(_ISSUE_TABLE_BASE_STYLE + row_styles_local))
 
         story.append(t_issues)
         story.append(Spacer(1, 6 * mm))
@@ -376,18 +464,9 @@ def generate_audit_report_pdf_file(audit_id: str, report: dict[str, Any]) -> str
         Paragraph("检查内容/Details", style_table_header),
     ]]
 
-    # Helper for status colors
-    def get_status_props(s):
-        if s == "PASS":
-            return colors.HexColor('#F0FFF4'), colors.HexColor('#22543D'), "通过"
-        if s == "WARNING":
-            return colors.HexColor('#FFFAF0'), colors.HexColor('#9C4221'), "警告"
-        if s == "FAIL":
-            return colors.HexColor('#FFF5F5'), colors.HexColor('#9B2C2C'), "错误"
-        return colors.white, color_text_primary, s
-
     row_styles = []
-    
+    status_para_cache: dict[str, Paragraph] = {}
+
     for i, check in enumerate(checks):
         status = str(check.get("status", ""))
         category = str(check.get("category", ""))
@@ -395,23 +474,15 @@ def generate_audit_report_pdf_file(audit_id: str, report: dict[str, Any]) -> str
         description = check.get("description", "")
         standard = check.get("standard", "")
 
-        bg_color, text_color, status_label = get_status_props(status)
+        bg_color, _, status_label = _STATUS_PROPS.get(status, (colors.white, _COLOR_TEXT_PRIMARY, status))
 
-        index_para = Paragraph(str(i + 1), ParagraphStyle(
-            'CheckIndexCell',
-            parent=style_normal,
-            alignment=TA_CENTER,
-            textColor=color_text_secondary,
-            fontSize=9,
-        ))
-
-        status_para = Paragraph(status_label, ParagraphStyle(
-            'StatusCell', parent=style_normal, alignment=TA_CENTER, textColor=text_color, fontName=title_font
-        ))
-        
-        category_para = Paragraph(category, ParagraphStyle(
-            'CategoryCell', parent=style_normal, alignment=TA_CENTER, textColor=color_text_secondary, fontSize=9
-        ))
+        index_para = secondary_para(str(i + 1))
+        status_para = status_para_cache.get(status)
+        if status_para is None:
+            status_para = status_para_cache[status] = Paragraph(
+                status_label, st["status"].get(status, st["status_default"])
+            )
+        category_para = secondary_para(category)
 
         details_flowables = [Paragraph(name, style_check_name)]
         if description:
@@ -429,7 +500,7 @@ def generate_audit_report_pdf_file(audit_id: str, report: dict[str, Any]) -> str
 
         row_idx = i + 1
         row_styles.append(('BACKGROUND', (1, row_idx), (1, row_idx), bg_color))
-        row_styles.append(('LINEBELOW', (0, row_idx), (-1, row_idx), 0.5, color_border))
+        row_styles.append(('LINEBELOW', (0, row_idx), (-1, row_idx), 0.5, _COLOR_BORDER))
 
     t_checks = Table(
         check_table_data,
@@ -438,19 +509,15 @@ def generate_audit_report_pdf_file(audit_id: str, report: dict[str, Any]) -> str
         hAlign='CENTER'
     )
     
-    table_style_list = [
-        ('BACKGROUND', (0, 0), (-1, 0), color_dark_blue),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-        ('PADDING', (0, 0), (-1, -1), 6),
-    ]
-    table_style_list.extend(row_styles)
-    t_checks.setStyle(TableStyle(table_style_list))
+    t_checks.setStyle(TableStyle(_CHECK_TABLE_BASE_STYLE + row_styles))
 
     story.append(t_checks)
 
     # Build the PDF
-    doc.build(story, onFirstPage=header_footer, onLaterPages=header_footer)
+    try:
+        doc.build(story, onFirstPage=header_footer, onLaterPages=header_footer)
+        os.replace(tmp_path, pdf_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
 
     return str(pdf_path)
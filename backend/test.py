@@ -1,10 +1,9 @@
 import secrets
-import string
 
 def generate_key(length=32):
-    """生成指定长度的随机密钥"""
-    alphabet = string.ascii_letters + string.digits
-    return ''.join(secrets.choice(alphabet) for _ in range(length))
+    """生成指定长度的随机密钥（URL 安全字符集：字母、数字、- 和 _）"""
+    # token_urlsafe(n) 由 n 字节随机数经 base64 编码得到，长度不小于 n，截取前 length 位即可
+    return secrets.token_urlsafe(length)[:length]
 
 # 生成 32 位密钥
 key = generate_key(32)
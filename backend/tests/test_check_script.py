@@ -0,0 +1,226 @@
+"""
+CheckFWFile 检查脚本的端到端测试。
+
+脚本在模块加载时即解析命令行、打开固件包并执行全部检查，因此每个用例都在独立子进程中
+运行脚本；子进程内把 pymongo.MongoClient 替换为记录写入内容的内存实现，
+测试据此断言 audit_checks / audits 中写入的检查项与汇总统计。
+"""
+import hashlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+import uuid
+import zipfile
+from pathlib import Path
+
+from reportlab.pdfgen import canvas
+
+SCRIPT_PATH = Path(__file__).resolve().parents[1] / "app" / "CheckFWFile_v1.3.1.py"
+
+# 子进程入口：替换 MongoClient 后以 __main__ 身份运行检查脚本，退出时把记录的写入内容输出为 JSON
+_DRIVER = r'''
+import atexit, json, runpy, sys
+import pymongo
+
+script, out_path, *argv = sys.argv[1:]
+recorded = {"audit_checks": [], "audit_logs": [], "audits": []}
+
+
+class _Collection:
+    def __init__(self, name):
+        self.name = name
+
+    def bulk_write(self, ops, ordered=True):
+        recorded[self.name].extend(op._doc for op in ops)
+
+    def update_one(self, filter, update, upsert=False):
+        recorded[self.name].append(update["$set"])
+
+
+class _Database:
+    def __getitem__(self, name):
+        return _Collection(name)
+
+
+class _Client:
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __getitem__(self, name):
+        return _Database()
+
+
+def _dump():
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(recorded, f, ensure_ascii=False, default=str)
+
+
+pymongo.MongoClient = _Client
+# atexit 按注册逆序执行：先于脚本注册，保证在脚本自身的 flush 之后输出
+atexit.register(_dump)
+sys.argv = [script] + argv
+runpy.run_path(script, run_name="__main__")
+'''
+
+
+def _tool_zip(names):
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as z:
+        for name in names:
+            info = zipfile.ZipInfo(name)
+            info.external_attr = 0o755 << 16
+            z.writestr(info, "#!/bin/sh\n")
+    return buf.getvalue()
+
+
+def build_bmc_package(directory, root, pre_test_report=None, full_test_report=False):
+    """
+    在 directory 下生成一个结构完整的 BMC 固件包 {root}.zip，返回其路径。
+
+    pre_test_report 可覆盖 TestReports 下预测试报告的文件名，默认按包名中的厂商/产品/版本号生成；
+    full_test_report 为 True 时额外放入首次提交才检查的 Full_Test_Report。
+    """
+    manufacturer, product, _, version = root.split("_", 3)
+    if pre_test_report is None:
+        pre_test_report = f"{manufacturer}_{product}_EVT_BMC_{version}_Pre-Test_Report.xlsx"
+
+    image_bin = os.urandom(4096)
+    image_hpm = os.urandom(2048)
+    inb_tool = _tool_zip(["InbUpdate.sh"])
+    oob_tool = _tool_zip(["OobUpdate.sh"])
+
+    # Release Note 中列出镜像与工具包的 MD5，供 MD5 校验类检查比对
+    release_note = io.BytesIO()
+    pdf = canvas.Canvas(release_note)
+    for i, data in enumerate((image_bin, image_hpm, inb_tool, oob_tool)):
+        pdf.drawString(50, 700 - 20 * i, f"MD5: {hashlib.md5(data).hexdigest()}")
+    pdf.showPage()
+    pdf.drawString(50, 700, "page2")
+    pdf.save()
+
+    zip_path = Path(directory) / f"{root}.zip"
+    with zipfile.ZipFile(zip_path, "w") as z:
+        for d in ("Tools/", "TestReports/", "Tools/UpdateTools/", "Tools/FruTools/"):
+            z.writestr(f"{root}/{d}", "")
+        z.writestr(f"{root}/Tools/UpdateTools/FW_Update_Tool_Release_Note.pdf", "x")
+        z.writestr(f"{root}/Tools/UpdateTools/FW_Update_Tool_User_Guide.pdf", "x")
+        z.writestr(f"{root}/TestReports/{pre_test_report}", "x")
+        if full_test_report:
+            z.writestr(f"{root}/TestReports/{manufacturer}_{product}_EVT_BMC_1st_Full_Test_Report.xlsx", "x")
+        z.writestr(f"{root}/{root}.bin", image_bin)
+        z.writestr(f"{root}/{root}.hpm", image_hpm)
+        z.writestr(f"{root}/BMC Load Default Config.xlsx", "x")
+        z.writestr(f"{root}/Release Note.pdf", release_note.getvalue())
+        z.writestr(f"{root}/BMC_Release_Guide.txt", "x")
+        z.writestr(f"{root}/InbUpdateTool.zip", inb_tool)
+        z.writestr(f"{root}/OobUpdateTool.zip", oob_tool)
+    return zip_path
+
+
+class CheckScriptTestCase(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp_dir = Path(self._tmp.name)
+        self.addCleanup(self._tmp.cleanup)
+
+    def run_script(self, zip_path, *extra_args):
+        """运行检查脚本，返回 (子进程结果, 记录的 Mongo 写入内容)；extra_args 追加到脚本命令行参数之后。"""
+        audit_id = f"test-{uuid.uuid4().hex}"
+        out_path = self.tmp_dir / "recorded.json"
+        log_file = SCRIPT_PATH.parent / "logs" / f"{audit_id}.log"
+        self.addCleanup(lambda: log_file.unlink(missing_ok=True))
+
+        proc = subprocess.run(
+            [sys.executable, "-c", _DRIVER, str(SCRIPT_PATH), str(out_path), "-f", str(zip_path), "-a", audit_id, *extra_args],
+            capture_output=True,
+            text=True,
+            timeout=300,
+        )
+        self.assertEqual(proc.returncode, 0, proc.stderr)
+        recorded = json.loads(out_path.read_text(encoding="utf-8"))
+        return proc, recorded
+
+    def find_check(self, checks, fragment):
+        matched = [c for c in checks if fragment in c["description"]]
+        self.assertTrue(matched, f"未找到包含 {fragment!r} 的检查项")
+        return matched[0]
+
+
+class ZipHandleTests(CheckScriptTestCase):
+    def test_all_checks_recorded(self):
+        # 各检查共用同一个 ZipFile 句柄，读取内嵌工具包与镜像的检查同样要执行完并写入结果
+        zip_path = build_bmc_package(self.tmp_dir, "Acme_X100_BMC_1.2.3")
+        proc, recorded = self.run_script(zip_path)
+
+        self.assertNotIn("Traceback", proc.stderr)
+        checks = recorded["audit_checks"]
+        self.assertEqual(len(checks), 29)
+        self.assertEqual(
+            {c["id"] for c in checks},
+            {
+                "test_files_in_zip",
+                "test_firmware_naming",
+                "test_flashtool_md5_zip",
+                "test_images_md5_zip",
+                "test_operation_tool",
+                "test_paths_in_zip",
+            },
+        )
+
+
+class SummaryTests(CheckScriptTestCase):
+    def test_warning_level_pass_counts_as_warning(self):
+        # Full_Test_Report 为告警级别检查：存在时检查状态为 PASS，但汇总统计计入 warning
+        zip_path = build_bmc_package(self.tmp_dir, "Acme_X100_BMC_1.2.3", full_test_report=True)
+        _, recorded = self.run_script(zip_path, "-s")
+
+        self.assertEqual(self.find_check(recorded["audit_checks"], "Full_Test_Report")["status"], "PASS")
+        self.assertEqual(
+            recorded["audits"][-1]["summary"],
+            {"total": 30, "passed": 29, "warning": 1, "failed": 0},
+        )
+
+    def test_warning_level_failure_counts_as_warning(self):
+        zip_path = build_bmc_package(self.tmp_dir, "Acme_X100_BMC_1.2.3")
+        _, recorded = self.run_script(zip_path, "-s")
+
+        self.assertEqual(self.find_check(recorded["audit_checks"], "Full_Test_Report")["status"], "WARNING")
+        self.assertEqual(
+            recorded["audits"][-1]["summary"],
+            {"total": 30, "passed": 29, "warning": 1, "failed": 0},
+        )
+
+
+class PathPatternTests(CheckScriptTestCase):
+    def test_regex_metacharacters_in_file_name(self):
+        # 厂商/产品/根目录中的 '+'、'('、'[' 都是正则元字符，必须按字面匹配且不能导致脚本崩溃
+        root = "Acme+Co_X(1)_BMC_1.0[x"
+        # 文件名解析出的版本号只取到 '[' 之前，即 1.0
+        zip_path = build_bmc_package(
+            self.tmp_dir, root, pre_test_report="Acme+Co_X(1)_EVT_BMC_1.0_Pre-Test_Report.xlsx"
+        )
+        proc, recorded = self.run_script(zip_path)
+
+        self.assertNotIn("PatternError", proc.stderr)
+        checks = recorded["audit_checks"]
+        self.assertTrue(checks)
+        self.assertEqual(self.find_check(checks, "Pre-Test_Report")["status"], "PASS")
+        self.assertEqual(self.find_check(checks, r"\.(ima|bin|ima_flasher|hpm|tar)")["status"], "PASS")
+
+    def test_version_dot_matches_literally(self):
+        # 版本号 1.2.3 中的 '.' 不能匹配任意字符，1x2x3 的报告名应判为缺失
+        root = "Acme_X100_BMC_1.2.3"
+        zip_path = build_bmc_package(
+            self.tmp_dir, root, pre_test_report="Acme_X100_EVT_BMC_1x2x3_Pre-Test_Report.xlsx"
+        )
+        _, recorded = self.run_script(zip_path)
+
+        self.assertEqual(self.find_check(recorded["audit_checks"], "Pre-Test_Report")["status"], "FAIL")
+
+
+if __name__ == "__main__":
+    unittest.main()